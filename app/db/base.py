@@ -616,9 +616,13 @@ class BaseStrategy(ABC):
                 main_orders = [o for o in orders if not o.get("is_hedge", False)]
                 
                 if hedge_orders and main_orders:
-                    # Hedge orders should have lower priority (execute first)
-                    min_hedge_priority = min(o.get("priority", 999) for o in hedge_orders)
-                    min_main_priority = min(o.get("priority", 999) for o in main_orders)
+                    # Hedge orders should have lower priority (execute first). Priorities
+                    # are 1-based (1 = first), so a leg without a priority key takes its
+                    # 1-based list position
+                    min_hedge_priority = min(o.get("priority", i) for i, o in enumerate(orders, 1)
+                                             if o.get("is_hedge", False))
+                    min_main_priority = min(o.get("priority", i) for i, o in enumerate(orders, 1)
+                                            if not o.get("is_hedge", False))
                     
                     if min_hedge_priority >= min_main_priority:
                         logger.warning(f"Hedge-first execution not properly configured for {self.name}")
@@ -11,7 +11,9 @@ Database Setup Script for F&O Trading System - Updated Version
 import sys
 import os
 import logging
+import argparse
 from datetime import datetime, date
+from typing import List, Tuple
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
@@ -42,10 +44,11 @@ class DatabaseSetup:
     Comprehensive database setup and initialization with event calendar integration
     """
     
-    def __init__(self):
+    def __init__(self, interactive: bool = True):
         self.engine = engine
         self.SessionLocal = sessionmaker(bind=self.engine)
         self.setup_successful = False
+        self.interactive = interactive  # False when prompts cannot be answered (CI, containers)
         
     def run_complete_setup(self):
         """Run the complete database setup process"""
@@ -594,6 +597,10 @@ class DatabaseSetup:
     def _create_sample_broker_account(self):
         """Create sample broker account (optional)"""
         try:
+            if not self.interactive:
+                logger.info("Non-interactive setup, skipping sample broker account creation")
+                return
+            
             print("\n" + "="*50)
             print("BROKER ACCOUNT SETUP (OPTIONAL)")
             print("="*50)
@@ -654,25 +661,12 @@ class DatabaseSetup:
         try:
             logger.info("Creating initial audit logs...")
             
-            self.create_audit_log(
-                "DATABASE_SETUP_STARTED", 
-                "Database setup process initiated"
-            )
-            
-            self.create_audit_log(
-                "TABLES_CREATED", 
-                "All database tables created successfully"
-            )
-            
-            self.create_audit_log(
-                "STRATEGIES_INITIALIZED", 
-                "All 8 hedged strategies initialized with default configurations"
-            )
-            
-            self.create_audit_log(
-                "SYSTEM_SETTINGS_CREATED", 
-                "System settings created with event calendar integration"
-            )
+            self._flush_audit([
+                ("DATABASE_SETUP_STARTED", "Database setup process initiated"),
+                ("TABLES_CREATED", "All database tables created successfully"),
+                ("STRATEGIES_INITIALIZED", "All 8 hedged strategies initialized with default configurations"),
+                ("SYSTEM_SETTINGS_CREATED", "System settings created with event calendar integration"),
+            ])
             
             logger.info("✅ Initial audit logs created")
             
@@ -718,9 +712,8 @@ class DatabaseSetup:
                 # Test event calendar integration
                 try:
                     from app.utils.event_calendar import event_calendar
-                    current_year = date.today().year
-                    holidays_count = len(event_calendar.market_holidays.get(current_year, []))
-                    logger.info(f"Event calendar: {holidays_count} holidays loaded for {current_year}")
+                    snap = event_calendar.snapshot(date.today(), [])
+                    logger.info(f"Event calendar: {snap.holidays_count} holidays loaded for {snap.today.year}")
                 except Exception as e:
                     logger.warning(f"Event calendar validation warning: {e}")
                 
@@ -752,24 +745,18 @@ class DatabaseSetup:
             # Event calendar status
             try:
                 from app.utils.event_calendar import event_calendar
-                current_year = date.today().year
-                holidays_count = len(event_calendar.market_holidays.get(current_year, []))
-                is_trading_today = event_calendar.is_trading_day(date.today())
+                snap = event_calendar.snapshot(date.today(), ["NIFTY", "BANKNIFTY"])
                 
                 print(f"📅 EVENT CALENDAR:")
-                print(f"   • Holidays Loaded for {current_year}: {holidays_count}")
-                print(f"   • Today's Status: {'Trading Day' if is_trading_today else 'Non-Trading Day'}")
+                print(f"   • Holidays Loaded for {snap.today.year}: {snap.holidays_count}")
+                print(f"   • Today's Status: {'Trading Day' if snap.is_trading_day else 'Non-Trading Day'}")
                 
                 # Next expiries
-                for instrument in ["NIFTY", "BANKNIFTY"]:
-                    try:
-                        expiry_info = event_calendar.get_next_expiry_info(instrument)
-                        if "error" not in expiry_info:
-                            days = expiry_info.get("days_to_expiry", 0)
-                            exp_type = expiry_info.get("expiry_type", "")
-                            print(f"   • {instrument} Next Expiry: {days} days ({exp_type})")
-                    except:
-                        pass
+                for instrument, expiry_info in snap.expiries.items():
+                    if "error" not in expiry_info:
+                        days = expiry_info.get("days_to_expiry", 0)
+                        exp_type = expiry_info.get("expiry_type", "")
+                        print(f"   • {instrument} Next Expiry: {days} days ({exp_type})")
                         
             except Exception as e:
                 print(f"📅 EVENT CALENDAR: Warning - {e}")
@@ -800,23 +787,43 @@ class DatabaseSetup:
     
     def create_audit_log(self, action: str, details: str):
         """Create audit log entry"""
+        self._flush_audit([(action, details)])
+    
+    def _flush_audit(self, entries: List[Tuple[str, str]]):
+        """Write (action, details) audit entries in one session, stamped with a single timestamp"""
         try:
+            now = datetime.now()
             with self.SessionLocal() as session:
-                audit_log = AuditLog(
-                    user_id=None,  # System action
-                    action=action,
-                    details=details,
-                    ip_address="127.0.0.1",
-                    user_agent="DatabaseSetup",
-                    created_at=datetime.now()
-                )
-                session.add(audit_log)
+                session.add_all([
+                    AuditLog(
+                        user_id=None,  # System action
+                        action=action,
+                        details=details,
+                        ip_address="127.0.0.1",
+                        user_agent="DatabaseSetup",
+                        created_at=now
+                    )
+                    for action, details in entries
+                ])
                 session.commit()
         except Exception as e:
             logger.error(f"Failed to create audit log: {e}")
 
 def main():
     """Main setup function"""
+    parser = argparse.ArgumentParser(description="F&O Trading System database setup")
+    parser.add_argument("-y", "--yes", action="store_true",
+                        help="Run without confirmation prompts")
+    parser.add_argument("--quiet", action="store_true",
+                        help="Only log warnings and errors")
+    args = parser.parse_args()
+    
+    if args.quiet:
+        logging.getLogger().setLevel(logging.WARNING)
+    
+    # Prompts would block forever without a terminal attached
+    interactive = sys.stdin.isatty() and not args.yes
+    
     try:
         print("=" * 60)
         print("F&O Trading System - Database Setup (Updated Version)")
@@ -833,13 +840,16 @@ def main():
         print()
         
         # Confirm setup
-        confirm = input("This will setup the complete database. Continue? (y/N): ").lower()
+        if interactive:
+            confirm = input("This will setup the complete database. Continue? (y/N): ").lower()
+        else:
+            confirm = 'y'
         if confirm != 'y':
             print("Setup cancelled.")
             return
         
         # Run setup
-        setup = DatabaseSetup()
+        setup = DatabaseSetup(interactive=interactive)
         setup.run_complete_setup()
         
         if setup.setup_successful:
@@ -8,10 +8,19 @@ from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+from types import MappingProxyType
+from functools import lru_cache
 import logging
+import re
 
 logger = logging.getLogger("base_strategy")
 
+# Shared read-only on_mtm_tick result for the common "nothing to do" tick
+NO_ACTION = MappingProxyType({"action": None})
+
+# Expiry/strike/option-type or FUT suffix stripped to recover the underlying
+_CONTRACT_SUFFIX_RE = re.compile(r'\d{2}[A-Z]{3}\d+[CP]E?|FUT')
+
 @dataclass
 class StrategySignal:
     """Standardized strategy signal structure"""
@@ -23,7 +32,7 @@ class StrategySignal:
     time_horizon: int  # Days
     message: str
 
-@dataclass
+@dataclass(slots=True)
 class OrderLeg:
     """Individual order leg in a multi-leg strategy"""
     symbol: str
@@ -35,6 +44,64 @@ class OrderLeg:
     leg_type: str  # "main_leg", "hedge_leg", "adjustment_leg"
     priority: int  # Execution order (1 = highest priority)
 
+@dataclass(slots=True, frozen=True)
+class TickContext:
+    """
+    Immutable per-tick market snapshot shared by every strategy evaluated on that tick
+    Fields left as None are unknown for this tick; strategies then use their config.
+    """
+    mtm: float
+    spot: Optional[float] = None
+    vix: Optional[float] = None
+    iv: Optional[float] = None
+    days_to_expiry: Optional[int] = None
+    
+    @classmethod
+    def from_dict(cls, mtm: float, data: Dict[str, Any]) -> "TickContext":
+        """Build a context from a legacy market-data/config dict"""
+        return cls(
+            mtm=mtm,
+            spot=data.get("spot_price"),
+            vix=data.get("current_vix", data.get("vix")),
+            iv=data.get("iv"),
+            days_to_expiry=data.get("days_to_expiry")
+        )
+
+@dataclass(slots=True)
+class PerfStats:
+    """Running performance statistics for a strategy"""
+    total_trades: int = 0
+    winning_trades: int = 0
+    total_pnl: float = 0.0
+    peak_pnl: float = 0.0
+    max_drawdown: float = 0.0  # Largest peak-to-trough fall in cumulative P&L
+    
+    @property
+    def avg_pnl(self) -> float:
+        return self.total_pnl / self.total_trades if self.total_trades else 0.0
+    
+    @property
+    def win_rate(self) -> float:
+        return self.winning_trades / self.total_trades * 100 if self.total_trades else 0.0
+    
+    def update(self, pnl: float):
+        """Fold a single trade P&L into the running statistics"""
+        self.total_trades += 1
+        self.total_pnl += pnl
+        self.winning_trades += pnl > 0
+        self.peak_pnl = max(self.peak_pnl, self.total_pnl)
+        self.max_drawdown = max(self.max_drawdown, self.peak_pnl - self.total_pnl)
+    
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "total_trades": self.total_trades,
+            "winning_trades": self.winning_trades,
+            "total_pnl": self.total_pnl,
+            "avg_pnl": self.avg_pnl,
+            "win_rate": self.win_rate,
+            "max_drawdown": self.max_drawdown
+        }
+
 class BaseStrategy(ABC):
     """
     Abstract base class for all Fces minimum 2-leg hedged structure and consistent interface
@@ -47,7 +114,7 @@ class BaseStrategy(ABC):
         self.required_hedge: bool = True  # Must have hedge protection
         self.is_active: bool = True
         self.last_signal: Optional[StrategySignal] = None
-        self.performance_metrics: Dict[str, float] = {}
+        self.perf_stats: PerfStats = PerfStats()
         
         # Risk parameters (overridden by subclasses)
         self.max_position_size: int = 10  # Maximum lots
@@ -58,6 +125,7 @@ class BaseStrategy(ABC):
         self.min_vix: float = 0.0
         self.max_vix: float = 50.0
         self.allowed_instruments: List[str] = ["NIFTY", "BANKNIFTY"]
+        self._allowed_set: frozenset = frozenset(self.allowed_instruments)
         self.blocked_on_expiry: bool = True
         self.blocked_on_events: bool = True
     
@@ -108,6 +176,27 @@ class BaseStrategy(ABC):
         """
         pass
     
+    def on_tick(self, ctx: TickContext, config: Dict[str, Any],
+                lot_count: int) -> Dict[str, Any]:
+        """
+        Struct-based entry point for the MTM hot path
+        
+        Callers build one TickContext per tick and reuse it across strategies.
+        Live VIX/DTE values that are set override the stored config; when neither
+        is set the config is passed through without a copy.
+        """
+        vix = ctx.vix
+        days_to_expiry = ctx.days_to_expiry
+        if vix is None and days_to_expiry is None:
+            return self.on_mtm_tick(ctx.mtm, config, lot_count)
+        
+        tick_config = dict(config)
+        if vix is not None:
+            tick_config["current_vix"] = vix
+        if days_to_expiry is not None:
+            tick_config["days_to_expiry"] = days_to_expiry
+        return self.on_mtm_tick(ctx.mtm, tick_config, lot_count)
+    
     def validate_strategy_structure(self, orders: List[Dict[str, Any]]) -> bool:
         """
         Validate that strategy meets hedged requirements
@@ -120,21 +209,19 @@ class BaseStrategy(ABC):
             logger.error(f"Strategy {self.name} too complex: {len(orders)} > {self.max_legs}")
             return False
         
-        # Check for hedge protection
-        if self.required_hedge:
-            has_hedge = any(order.get("is_hedge", False) for order in orders)
-            if not has_hedge:
-                logger.error(f"Strategy {self.name} missing required hedge protection")
-                return False
-        
-        # Validate instruments
+        # Validate instruments and collect hedge protection in a single pass
+        has_hedge = False
         for order in orders:
-            symbol = order.get("symbol", "")
-            base_symbol = self._extract_base_symbol(symbol)
-            if base_symbol not in self.allowed_instruments:
+            has_hedge = has_hedge or order.get("is_hedge", False)
+            base_symbol = self._extract_base_symbol(order.get("symbol", ""))
+            if base_symbol not in self._allowed_set:
                 logger.error(f"Strategy {self.name} using blocked instrument: {base_symbol}")
                 return False
         
+        if self.required_hedge and not has_hedge:
+            logger.error(f"Strategy {self.name} missing required hedge protection")
+            return False
+        
         return True
     
     def calculate_position_risk(self, orders: List[Dict[str, Any]], 
@@ -232,8 +319,10 @@ class BaseStrategy(ABC):
     def _check_time_exit(self, current_data: Dict[str, Any], 
                         entry_data: Dict[str, Any]) -> bool:
         """Check if position should be exited based on time"""
-        entry_time = entry_data.get("entry_time", datetime.now())
-        current_time = current_data.get("current_time", datetime.now())
+        # Only fall back to the wall clock when the caller did not supply a time
+        current_time = current_data.get("current_time")
+        if current_time is None:
+            current_time = datetime.now()
         
         # Exit before expiry day
         expiry_date = entry_data.get("expiry_date")
@@ -275,8 +364,7 @@ class BaseStrategy(ABC):
     
     def _extract_base_symbol(self, symbol: str) -> str:
         """Extract base symbol from option/futures symbol"""
-        import re
-        base = re.sub(r'\d{2}[A-Z]{3}\d+[CP]E?|FUT', '', symbol)
+        base = _CONTRACT_SUFFIX_RE.sub('', symbol)
         return base.replace("NSE:", "").replace("NFO:", "").replace("BSE:", "")
     
     def get_strategy_info(self) -> Dict[str, Any]:
@@ -296,40 +384,28 @@ class BaseStrategy(ABC):
             "blocked_on_events": self.blocked_on_events
         }
     
+    @property
+    def performance_metrics(self) -> Dict[str, float]:
+        """Snapshot of performance statistics as a plain dict"""
+        return self.perf_stats.as_dict()
+    
     def update_performance_metrics(self, trade_result: Dict[str, Any]):
         """Update strategy performance metrics"""
-        if "performance_metrics" not in self.__dict__:
-            self.performance_metrics = {
-                "total_trades": 0,
-                "winning_trades": 0,
-                "total_pnl": 0.0,
-                "avg_pnl": 0.0,
-                "win_rate": 0.0,
-                "max_drawdown": 0.0
-            }
-        
-        # Update metrics
-        self.performance_metrics["total_trades"] += 1
-        pnl = trade_result.get("pnl", 0.0)
-        self.performance_metrics["total_pnl"] += pnl
-        
-        if pnl > 0:
-            self.performance_metrics["winning_trades"] += 1
-        
-        # Recalculate derived metrics
-        self.performance_metrics["avg_pnl"] = (
-            self.performance_metrics["total_pnl"] / 
-            self.performance_metrics["total_trades"]
-        )
-        self.performance_metrics["win_rate"] = (
-            self.performance_metrics["winning_trades"] / 
-            self.performance_metrics["total_trades"] * 100
-        )
+        stats = self.perf_stats
+        stats.update(trade_result.get("pnl", 0.0))
         
         logger.info(f"Updated {self.name} performance: "
-                   f"Trades: {self.performance_metrics['total_trades']}, "
-                   f"Win Rate: {self.performance_metrics['win_rate']:.1f}%, "
-                   f"Avg P&L: ₹{self.performance_metrics['avg_pnl']:.0f}")
+                   f"Trades: {stats.total_trades}, "
+                   f"Win Rate: {stats.win_rate:.1f}%, "
+                   f"Avg P&L: ₹{stats.avg_pnl:.0f}")
+
+@lru_cache(maxsize=4096)
+def option_symbol(symbol: str, expiry: str, strike: int, option_type: str) -> str:
+    """
+    Build an option contract symbol, e.g. NIFTY25JUL22000CE
+    Cached so repeated contracts share one string object across orders
+    """
+    return f"{symbol}{expiry}{strike}{option_type}"
 
 # Utility functions for strategy validation
 def validate_hedged_structure(orders: List[Dict[str, Any]]) -> Tuple[bool, str]:
@@ -373,6 +449,10 @@ __all__ = [
     "BaseStrategy",
     "StrategySignal", 
     "OrderLeg",
+    "PerfStats",
+    "TickContext",
+    "NO_ACTION",
     "validate_hedged_structure",
-    "calculate_net_premium"
+    "calculate_net_premium",
+    "option_symbol"
 ]
@@ -7,13 +7,76 @@ Broken Wing Butterfly Strategy – F&O (NIFTY/BANKNIFTY only) | 4-leg asymmetric
 """
 
 from datetime import datetime
-from typing import Dict, List, Any
-from app.strategies.base import BaseStrategy
+from typing import Dict, List, Any, Tuple, NamedTuple, Union
+from app.strategies.base import BaseStrategy, NO_ACTION, option_symbol
 from app.config import StrategyType, get_instrument_config
+import numpy as np
 import logging
 
 logger = logging.getLogger("BrokenWingButterflyStrategy")
 
+# Directional biases that qualify for a broken wing entry
+_ENTRY_BIASES = frozenset({"SLIGHTLY_BULLISH", "SLIGHTLY_BEARISH"})
+
+# Integer encoding of directional bias for array-based evaluation
+BIAS_CODES = {"BULLISH": 1, "BEARISH": -1, "NEUTRAL": 0}
+
+# Action names indexed by the codes returned from on_mtm_tick_batch (-1 = no action)
+BATCH_ACTIONS = (
+    "HARD_STOP",
+    "TAKE_PROFIT",
+    "EXPIRY_RISK_EXIT",
+    "SOFT_WARN",
+    "EARLY_PROFIT_OPPORTUNITY"
+)
+
+class Strikes(NamedTuple):
+    """Broken wing butterfly strikes in fixed leg order"""
+    lower: float = 0.0
+    middle: float = 0.0
+    upper: float = 0.0
+    
+    @classmethod
+    def from_dict(cls, strikes: Dict[str, float]) -> "Strikes":
+        """Build from a legacy strikes dict; missing legs are 0 and extra keys are ignored"""
+        return cls(*(strikes.get(field, 0) for field in cls._fields))
+
+class Premiums(NamedTuple):
+    """Per-leg option premiums in fixed leg order"""
+    lower: float = 0.0
+    middle: float = 0.0
+    upper: float = 0.0
+    safety: float = 0.0
+    
+    @classmethod
+    def from_dict(cls, premiums: Dict[str, float]) -> "Premiums":
+        """Build from a legacy premiums dict; missing legs are 0 and extra keys are ignored"""
+        return cls(*(premiums.get(field, 0) for field in cls._fields))
+
+# Result codes of _bwb_validate_core
+_BWB_OK = 0
+_BWB_BAD_ORDER = 1  # Strikes not strictly increasing
+_BWB_BAD_RATIO = 2  # Long/short wing ratio outside the allowed range
+
+def _bwb_validate_core(lower: float, middle: float, upper: float,
+                       min_ratio: float, max_ratio: float) -> int:
+    """Pure numeric broken wing structure check; logging is left to the caller"""
+    if not (lower < middle < upper):
+        return _BWB_BAD_ORDER
+    wing_ratio = (upper - middle) / (middle - lower)
+    if wing_ratio < min_ratio or wing_ratio > max_ratio:
+        return _BWB_BAD_RATIO
+    return _BWB_OK
+
+def _bwb_breakevens_core(lower: float, upper: float, p_lower: float,
+                         p_middle: float, p_upper: float) -> Tuple[float, float, float]:
+    """
+    Net premium and breakevens of a broken wing butterfly
+    Pure arithmetic, so it also works elementwise on NumPy arrays of candidates
+    """
+    net_premium = p_middle * 2 - p_lower - p_upper  # Sold 2x middle, bought both wings
+    return net_premium, lower + net_premium, upper - net_premium
+
 class BrokenWingButterflyStrategy(BaseStrategy):
     """
     Broken Wing Butterfly Strategy - 4-leg asymmetric structure:
@@ -29,18 +92,26 @@ class BrokenWingButterflyStrategy(BaseStrategy):
     required_leg_count = 4
     allowed_instruments = ["NIFTY", "BANKNIFTY"]
     
+    # Entry and risk limits
+    MIN_VIX = 18.0  # Minimum volatility required
+    MAX_VIX = 32.0  # Upper limit for entry
+    TARGET_WIN_RATE = 75.0  # Expected win rate
+    MAX_LOSS_PER_TRADE = 3500.0  # Moderate risk tolerance
+    
+    # Broken Wing Butterfly specific parameters
+    MIN_WING_RATIO = 1.2  # Minimum ratio between wings (asymmetry)
+    MAX_WING_RATIO = 3.0  # Maximum wing ratio for reasonable risk
+    PREFERRED_NET_CREDIT = True  # Prefer net credit structures
+    SKEW_MULTIPLIER = 1.5  # How much to skew towards profitable side
+    
     def __init__(self):
         super().__init__()
-        self.min_v volatility required
-        self.max_vix = 32.0  # Upper limit for entry
-        self.target_win_rate = 75.0  # Expected win rate
-        self.max_loss_per_trade = 3500.0  # Moderate risk tolerance
-        
-        # Broken Wing Butterfly specific parameters
-        self.min_wing_ratio = 1.2  # Minimum ratio between wings (asymmetry)
-        self.max_wing_ratio = 3.0  # Maximum wing ratio for reasonable risk
-        self.preferred_net_credit = True  # Prefer net credit structures
-        self.skew_multiplier = 1.5  # How much to skew towards profitable side
+        # BaseStrategy initialises these per instance; mirror the class constants
+        # so get_strategy_info() and risk calculations report BWB limits
+        self.min_vix = self.MIN_VIX
+        self.max_vix = self.MAX_VIX
+        self.target_win_rate = self.TARGET_WIN_RATE
+        self.max_loss_per_trade = self.MAX_LOSS_PER_TRADE
 
     def evaluate_market_conditions(self, market_data: Dict, settings: Dict) -> bool:
         """
@@ -51,22 +122,18 @@ class BrokenWingButterflyStrategy(BaseStrategy):
         - No major events or expiry day
         - Sufficient premium skew for asymmetric structure
         """
-        symbol = market_data.get("symbol")
-        vix = market_data.get("vix", 0)
-        index_chg = market_data.get("index_chg_pct", 0)
-        events = market_data.get("upcoming_events", [])
-        expiry = market_data.get("is_expiry", False)
-        directional_bias = market_data.get("directional_bias", "NEUTRAL")
-        iv_skew = market_data.get("iv_skew", 0)  # Implied volatility skew
+        # Cheapest and most selective checks first; later lookups are skipped on rejection
+        if market_data.get("symbol") not in self._allowed_set:
+            return False
+        if market_data.get("is_expiry", False) or market_data.get("upcoming_events"):
+            return False
         
+        danger_zone_warning = settings.get("DANGER_ZONE_WARNING", 1.0)
         return (
-            symbol in self.allowed_instruments and
-            self.min_vix <= vix <= self.max_vix and
-            abs(index_chg) < settings.get("DANGER_ZONE_WARNING", 1.0) and
-            not expiry and
-            not events and
-            directional_bias in ["SLIGHTLY_BULLISH", "SLIGHTLY_BEARISH"] and
-            abs(iv_skew) > 2.0  # Sufficient skew for asymmetric advantage
+            self.MIN_VIX <= market_data.get("vix", 0) <= self.MAX_VIX and
+            abs(market_data.get("index_chg_pct", 0)) < danger_zone_warning and
+            market_data.get("directional_bias", "NEUTRAL") in _ENTRY_BIASES and
+            abs(market_data.get("iv_skew", 0)) > 2.0  # Sufficient skew for asymmetric advantage
         )
 
     def generate_orders(self, signal: Dict, config: Dict, lot_size: int) -> List[Dict[str, Any]]:
@@ -106,18 +173,20 @@ class BrokenWingButterflyStrategy(BaseStrategy):
         # Determine option type
         option_type = "CE" if direction == "CALL" else "PE"
         
-        # Calculate wing distances for logging
-        short_wing = middle_strike - lower_strike
-        long_wing = upper_strike - middle_strike
-        wing_ratio = long_wing / short_wing if short_wing > 0 else 1.0
+        safety_strike = self._calculate_safety_strike(upper_strike, bias, symbol)
+        wing_qty = lots * lot_qty
+        body_qty = 2 * wing_qty
+        
+        def mk_sym(strike: float) -> str:
+            return option_symbol(symbol, expiry, int(strike), option_type)
         
         orders = [
             # 1. BUY Lower Strike (hedge)
             {
-                "symbol": f"{symbol}{expiry}{int(lower_strike)}{option_type}",
+                "symbol": mk_sym(lower_strike),
                 "side": "BUY",
                 "lots": lots,
-                "quantity": lots * lot_qty,
+                "quantity": wing_qty,
                 "leg_type": "long_lower",
                 "is_hedge": True,
                 "strike": lower_strike,
@@ -128,10 +197,10 @@ class BrokenWingButterflyStrategy(BaseStrategy):
             
             # 2. SELL Middle Strike (2 contracts - main risk)
             {
-                "symbol": f"{symbol}{expiry}{int(middle_strike)}{option_type}",
+                "symbol": mk_sym(middle_strike),
                 "side": "SELL",
                 "lots": 2 * lots,  # Double quantity for butterfly body
-                "quantity": 2 * lots * lot_qty,
+                "quantity": body_qty,
                 "leg_type": "short_middle",
                 "is_hedge": False,
                 "strike": middle_strike,
@@ -142,10 +211,10 @@ class BrokenWingButterflyStrategy(BaseStrategy):
             
             # 3. BUY Upper Strike (hedge)
             {
-                "symbol": f"{symbol}{expiry}{int(upper_strike)}{option_type}",
+                "symbol": mk_sym(upper_strike),
                 "side": "BUY", 
                 "lots": lots,
-                "quantity": lots * lot_qty,
+                "quantity": wing_qty,
                 "leg_type": "long_upper",
                 "is_hedge": True,
                 "strike": upper_strike,
@@ -157,24 +226,28 @@ class BrokenWingButterflyStrategy(BaseStrategy):
             # 4. Additional hedge if needed for risk management
             # (This could be a farther OTM option for extra protection)
             {
-                "symbol": f"{symbol}{expiry}{int(self._calculate_safety_strike(upper_strike, bias, symbol))}{option_type}",
+                "symbol": mk_sym(safety_strike),
                 "side": "BUY",
                 "lots": lots,
-                "quantity": lots * lot_qty,
+                "quantity": wing_qty,
                 "leg_type": "safety_hedge",
                 "is_hedge": True,
-                "strike": self._calculate_safety_strike(upper_strike, bias, symbol),
+                "strike": safety_strike,
                 "option_type": option_type,
                 "expiry": expiry,
                 "wing_position": "safety_wing"
             }
         ]
         
-        logger.info(f"Generated Broken Wing Butterfly for {symbol}: "
-                   f"{direction} {bias} bias, "
-                   f"Strikes: {lower_strike}/{middle_strike}/{upper_strike}, "
-                   f"Wing Ratio: {wing_ratio:.2f}, "
-                   f"Short Wing: {short_wing}, Long Wing: {long_wing}")
+        if logger.isEnabledFor(logging.INFO):
+            # Wing distances are only needed for the log line
+            short_wing = middle_strike - lower_strike
+            long_wing = upper_strike - middle_strike
+            wing_ratio = long_wing / short_wing if short_wing > 0 else 1.0
+            logger.info("Generated Broken Wing Butterfly for %s: %s %s bias, "
+                        "Strikes: %s/%s/%s, Wing Ratio: %.2f, Short Wing: %s, Long Wing: %s",
+                        symbol, direction, bias, lower_strike, middle_strike, upper_strike,
+                        wing_ratio, short_wing, long_wing)
         
         return orders
 
@@ -209,7 +282,12 @@ class BrokenWingButterflyStrategy(BaseStrategy):
         
         days_to_expiry = config.get("days_to_expiry", 10)
         
-        if mtm <= -sl:
+        # Thresholds computed once so the ladder below is pure comparisons
+        sl_threshold = -sl
+        soft_threshold = -0.75 * sl
+        early_threshold = 0.6 * tp
+        
+        if mtm <= sl_threshold:
             return {
                 "action": "HARD_STOP",
                 "reason": f"Broken Wing Butterfly SL triggered (bias: {bias})",
@@ -227,45 +305,69 @@ class BrokenWingButterflyStrategy(BaseStrategy):
                 "reason": f"High gamma risk: {days_to_expiry} DTE, {underlying_move:.1f}% move",
                 "urgency": "HIGH"
             }
-        elif mtm <= -0.75 * sl:
+        elif mtm <= soft_threshold:
             return {
                 "action": "SOFT_WARN",
                 "reason": f"Approaching Broken Wing SL (bias working against: {bias})",
                 "urgency": "MEDIUM"
             }
-        elif mtm >= 0.6 * tp and days_to_expiry <= 7:
+        elif mtm >= early_threshold and days_to_expiry <= 7:
             return {
                 "action": "EARLY_PROFIT_OPPORTUNITY",
                 "reason": f"Good profit with week to expiry (bias: {bias})",
                 "urgency": "LOW"
             }
         
-        return {"action": None}
+        return NO_ACTION
+
+    def on_mtm_tick_batch(self, mtm: np.ndarray, base_sl: np.ndarray, base_tp: np.ndarray,
+                          days_to_expiry: np.ndarray, underlying_move: np.ndarray,
+                          bias_code: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the on_mtm_tick ladder for a whole book of BWB positions at once
+        
+        Args:
+            mtm: Current MTM per position
+            base_sl / base_tp: SL/TP per position (already multiplied by lot count)
+            days_to_expiry: Days to expiry per position
+            underlying_move: Underlying change % since entry per position
+            bias_code: Directional bias per position encoded with BIAS_CODES
+            
+        Returns:
+            int8 array of indices into BATCH_ACTIONS, -1 where no action is needed;
+            use np.flatnonzero(codes >= 0) to dispatch only the triggered positions
+        """
+        favorable = ((bias_code > 0) & (underlying_move > 0)) | ((bias_code < 0) & (underlying_move < 0))
+        adverse = ((bias_code > 0) & (underlying_move < -1.0)) | ((bias_code < 0) & (underlying_move > 1.0))
+        tp = np.where(favorable, base_tp * 1.2, base_tp)
+        sl = np.where(adverse, base_sl * 0.8, base_sl)
+        
+        conditions = [
+            mtm <= -sl,
+            mtm >= tp,
+            (days_to_expiry <= 3) & (np.abs(underlying_move) > 1.5),
+            mtm <= -0.75 * sl,
+            (mtm >= 0.6 * tp) & (days_to_expiry <= 7)
+        ]
+        return np.select(conditions, range(len(BATCH_ACTIONS)), default=-1).astype(np.int8)
 
     def _validate_broken_wing_structure(self, lower_strike: float, middle_strike: float,
                                        upper_strike: float, bias: str) -> bool:
         """
         Validate that strikes create proper broken wing butterfly structure
         """
-        # Basic order validation
-        if not (lower_strike < middle_strike < upper_strike):
-            logger.error(f"Invalid strike order: {lower_strike} < {middle_strike} < {upper_strike}")
-            return False
-        
-        # Calculate wing distances
-        short_wing = middle_strike - lower_strike
-        long_wing = upper_strike - middle_strike
+        code = _bwb_validate_core(lower_strike, middle_strike, upper_strike,
+                                  self.MIN_WING_RATIO, self.MAX_WING_RATIO)
         
-        if short_wing <= 0 or long_wing <= 0:
-            logger.error("Wing distances must be positive")
+        if code == _BWB_BAD_ORDER:
+            logger.error("Invalid strike order: %s < %s < %s", lower_strike, middle_strike, upper_strike)
             return False
         
-        # Check wing ratio for proper asymmetry
-        wing_ratio = long_wing / short_wing
+        wing_ratio = (upper_strike - middle_strike) / (middle_strike - lower_strike)
         
-        if wing_ratio < self.min_wing_ratio or wing_ratio > self.max_wing_ratio:
-            logger.error(f"Wing ratio {wing_ratio:.2f} outside valid range "
-                        f"[{self.min_wing_ratio}, {self.max_wing_ratio}]")
+        if code == _BWB_BAD_RATIO:
+            logger.error("Wing ratio %.2f outside valid range [%s, %s]",
+                         wing_ratio, self.MIN_WING_RATIO, self.MAX_WING_RATIO)
             return False
         
         # Validate bias matches structure
@@ -276,6 +378,21 @@ class BrokenWingButterflyStrategy(BaseStrategy):
         
         return True
 
+    def validate_broken_wing_batch(self, lowers: np.ndarray, middles: np.ndarray,
+                                   uppers: np.ndarray) -> np.ndarray:
+        """
+        Validate many candidate strike triplets at once (strategy selector sweeps)
+        
+        Returns:
+            int8 array of _bwb_validate_core codes (0 = valid)
+        """
+        ordered = (lowers < middles) & (middles < uppers)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            wing_ratio = (uppers - middles) / (middles - lowers)
+        ratio_ok = (wing_ratio >= self.MIN_WING_RATIO) & (wing_ratio <= self.MAX_WING_RATIO)
+        return np.where(~ordered, _BWB_BAD_ORDER,
+                        np.where(ratio_ok, _BWB_OK, _BWB_BAD_RATIO)).astype(np.int8)
+
     def _calculate_safety_strike(self, upper_strike: float, bias: str, symbol: str) -> float:
         """
         Calculate additional safety hedge strike
@@ -287,29 +404,27 @@ class BrokenWingButterflyStrategy(BaseStrategy):
         
         return upper_strike + safety_buffer
 
-    def calculate_asymmetric_breakevens(self, strikes: Dict[str, float],
-                                      premiums: Dict[str, float]) -> Dict[str, float]:
+    def calculate_asymmetric_breakevens(self, strikes: Union[Strikes, Dict[str, float]],
+                                      premiums: Union[Premiums, Dict[str, float]]) -> Dict[str, float]:
         """
         Calculate breakeven points for asymmetric butterfly structure
         """
-        lower = strikes.get("lower", 0)
-        middle = strikes.get("middle", 0)
-        upper = strikes.get("upper", 0)
-        
-        # Net premium calculation (simplified)
-        net_premium = (
-            premiums.get("middle", 0) * 2 -  # Sold 2x middle
-            premiums.get("lower", 0) -       # Bought lower
-            premiums.get("upper", 0)         # Bought upper
+        if isinstance(strikes, dict):
+            strikes = Strikes.from_dict(strikes)
+        if isinstance(premiums, dict):
+            premiums = Premiums.from_dict(premiums)
+        
+        net_premium, lower_breakeven, upper_breakeven = _bwb_breakevens_core(
+            strikes.lower, strikes.upper, premiums.lower, premiums.middle, premiums.upper
         )
         
         return {
-            "lower_breakeven": lower + net_premium,
-            "upper_breakeven": upper - net_premium,
-            "max_profit_point": middle,
+            "lower_breakeven": lower_breakeven,
+            "upper_breakeven": upper_breakeven,
+            "max_profit_point": strikes.middle,
             "net_credit_debit": net_premium,
-            "profit_range_lower": lower + net_premium,
-            "profit_range_upper": upper - net_premium
+            "profit_range_lower": lower_breakeven,
+            "profit_range_upper": upper_breakeven
         }
 
     def check_directional_bias_performance(self, current_data: Dict, 
@@ -378,13 +493,13 @@ class BrokenWingButterflyStrategy(BaseStrategy):
         
         broken_wing_metrics = {
             "wing_ratio_range": {
-                "min": self.min_wing_ratio,
-                "max": self.max_wing_ratio
+                "min": self.MIN_WING_RATIO,
+                "max": self.MAX_WING_RATIO
             },
             "preferred_structure": "Net credit with directional bias",
             "asymmetric_profile": True,
             "directional_sensitivity": "MODERATE",
-            "skew_multiplier": self.skew_multiplier,
+            "skew_multiplier": self.SKEW_MULTIPLIER,
             "optimal_conditions": "Moderate IV with slight directional bias",
             "gamma_risk": "MANAGED by hedge structure",
             "theta_advantage": "MODERATE (time decay helps)",
@@ -404,40 +519,61 @@ def calculate_wing_asymmetry_ratio(short_wing: float, long_wing: float) -> float
         return 1.0
     return long_wing / short_wing
 
-def validate_broken_wing_credit_structure(strikes: Dict[str, float],
-                                        premiums: Dict[str, float]) -> bool:
+def validate_broken_wing_credit_structure(strikes: Union[Strikes, Dict[str, float]],
+                                        premiums: Union[Premiums, Dict[str, float]]) -> bool:
     """
     Validate that the broken wing structure results in net credit
     (preferred for eliminating risk on one side)
     """
-    net_credit = (
-        premiums.get("middle", 0) * 2 -  # Sold 2x middle
-        premiums.get("lower", 0) -       # Bought lower  
-        premiums.get("upper", 0) -       # Bought upper
-        premiums.get("safety", 0)        # Bought safety hedge
-    )
+    if isinstance(premiums, dict):
+        premiums = Premiums.from_dict(premiums)
+    lower, middle, upper, safety = premiums
     
-    return net_credit > 0
+    # Sold 2x middle, bought lower, upper and safety hedge
+    return middle * 2 - lower - upper - safety > 0
 
-def calculate_directional_advantage(wing_ratio: float, bias: str) -> float:
+def calculate_directional_advantage(wing_ratio: Union[float, np.ndarray],
+                                    bias: Union[str, int, np.ndarray]) -> Union[float, np.ndarray]:
     """
     Calculate the directional advantage score based on wing structure and bias
     Higher scores indicate better directional alignment
+    
+    bias may be a bias string or BIAS_CODES integer(s); with array inputs a whole
+    candidate set is scored in one call
     """
-    if bias == "BULLISH":
-        # For bullish bias, prefer longer upper wing (ratio > 1)
-        return min(1.0, wing_ratio / 2.0)
-    elif bias == "BEARISH":
-        # For bearish bias, prefer longer lower wing (ratio < 1)
-        return min(1.0, (2.0 - wing_ratio) / 2.0)
-    else:
+    if isinstance(bias, str):
+        bias = BIAS_CODES.get(bias, 0)
+    
+    # Scalar calls (one candidate at a time) skip the NumPy dispatch overhead
+    if isinstance(wing_ratio, (int, float)) and isinstance(bias, int):
+        if bias > 0:
+            # For bullish bias, prefer longer upper wing (ratio > 1)
+            return min(1.0, wing_ratio / 2.0)
+        if bias < 0:
+            # For bearish bias, prefer longer lower wing (ratio < 1)
+            return min(1.0, (2.0 - wing_ratio) / 2.0)
         # Neutral bias prefers balanced wings (ratio close to 1)
         return 1.0 - abs(wing_ratio - 1.0)
+    
+    score = np.where(
+        np.greater(bias, 0),
+        np.minimum(1.0, wing_ratio / 2.0),  # Bullish prefers longer upper wing (ratio > 1)
+        np.where(
+            np.less(bias, 0),
+            np.minimum(1.0, (2.0 - wing_ratio) / 2.0),  # Bearish prefers longer lower wing (ratio < 1)
+            1.0 - np.abs(wing_ratio - 1.0)  # Neutral prefers balanced wings
+        )
+    )
+    return score if score.ndim else float(score)
 
 # Export the strategy class and utilities
 __all__ = [
     "BrokenWingButterflyStrategy",
     "calculate_wing_asymmetry_ratio",
     "validate_broken_wing_credit_structure", 
-    "calculate_directional_advantage"
+    "calculate_directional_advantage",
+    "Strikes",
+    "Premiums",
+    "BIAS_CODES",
+    "BATCH_ACTIONS"
 ]
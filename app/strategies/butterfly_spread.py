@@ -7,13 +7,47 @@ Butterfly Spread Strategy – F&O (NIFTY/BANKNIFTY only) | 4-leg hedged structur
 """
 
 from datetime import datetime
-from typing import Dict, List, Any
-from app.strategies.base import BaseStrategy
+from typing import Dict, List, Any, Optional, Tuple, Union
+from types import MappingProxyType
+from functools import lru_cache
+import numpy as np
+from app.strategies.base import BaseStrategy, NO_ACTION
 from app.config import StrategyType, get_instrument_config, validate_instrument_liquidity
 import logging
 
 logger = logging.getLogger("ButterflySpreadStrategy")
 
+# Liquidity is fixed for the process lifetime, so resolve it once for the
+# tradable indices instead of on every signal
+_LIQUID = {s: validate_instrument_liquidity(s) for s in ("NIFTY", "BANKNIFTY")}
+
+@lru_cache(maxsize=8)
+def _lot_qty(symbol: str) -> int:
+    """Lot size per instrument; instrument config is fixed for the process lifetime"""
+    return get_instrument_config(symbol).get("lot_size", 50)
+
+# Shared read-only on_mtm_tick results (EXPIRY_MANAGEMENT carries the live DTE)
+_HARD_STOP = MappingProxyType({
+    "action": "HARD_STOP",
+    "reason": "Butterfly Spread SL triggered (max debit loss)",
+    "urgency": "HIGH"
+})
+_TAKE_PROFIT = MappingProxyType({
+    "action": "TAKE_PROFIT",
+    "reason": "Butterfly Spread TP achieved",
+    "urgency": "MEDIUM"
+})
+_PROFIT_OPPORTUNITY = MappingProxyType({
+    "action": "PROFIT_OPPORTUNITY",
+    "reason": "50% max profit achieved with time decay benefit",
+    "urgency": "LOW"
+})
+_SOFT_WARN = MappingProxyType({
+    "action": "SOFT_WARN",
+    "reason": "Approaching Butterfly Spread maximum loss",
+    "urgency": "MEDIUM"
+})
+
 class ButterflySpreadStrategy(BaseStrategy):
     """
     Long Butterfly Spread Strategy - 4-leg hedged structure:
@@ -29,6 +63,21 @@ class ButterflySpreadStrategy(BaseStrategy):
     required_leg_count = 4
     allowed_instruments = ["NIFTY", "BANKNIFTY"]
     
+    # Leg descriptors in hedge-first execution order; orders[i] is execution step i,
+    # so legs carry no separate priority key:
+    # (strike key, lot multiplier, fields shared by every order for that leg)
+    _LEG_TEMPLATES = (
+        # 1. BUY Lower Strike (FIRST - hedge protection)
+        ("lower", 1, {"side": "BUY", "leg_type": "long_lower", "is_hedge": True,
+                      "execution_order": "HEDGE_FIRST"}),
+        # 2. BUY Upper Strike (SECOND - hedge protection)
+        ("upper", 1, {"side": "BUY", "leg_type": "long_upper", "is_hedge": True,
+                      "execution_order": "HEDGE_FIRST"}),
+        # 3. SELL 2x Middle Strike (THIRD - after hedges in place)
+        ("center", 2, {"side": "SELL", "leg_type": "short_middle", "is_hedge": False,
+                       "execution_order": "MAIN_AFTER_HEDGE"}),
+    )
+    
     def __init__(self):
         super().__init__()
         self.min_vix = 12.0  # Low volatility preferred
@@ -61,8 +110,8 @@ class ButterflySpreadStrategy(BaseStrategy):
         days_to_expiry = market_data.get("days_to_expiry", 0)
         
         # Strict liquidity validation
-        if not validate_instrument_liquidity(symbol):
-            logger.warning(f"Butterfly Spread rejected: {symbol} not in liquid instruments")
+        if not _LIQUID.get(symbol, False):
+            logger.warning("Butterfly Spread rejected: %s not in liquid instruments", symbol)
             return False
         
         return (
@@ -75,6 +124,33 @@ class ButterflySpreadStrategy(BaseStrategy):
             self.min_days_to_expiry <= days_to_expiry <= self.max_days_to_expiry
         )
 
+    def evaluate_market_conditions_batch(self, market_frame: Any, settings: Dict) -> np.ndarray:
+        """
+        Vectorized evaluate_market_conditions for watchlist scans
+        market_frame is a pandas DataFrame (or dict of equal-length arrays) with
+        the evaluate_market_conditions keys as columns; upcoming events are given
+        as an "upcoming_events_len" count column. Returns a boolean mask per row.
+        """
+        symbols = np.asarray(market_frame["symbol"])
+        n = len(symbols)
+        
+        def column(name: str, default: Any) -> np.ndarray:
+            return np.asarray(market_frame[name]) if name in market_frame else np.full(n, default)
+        
+        vix = column("vix", 0.0)
+        days_to_expiry = column("days_to_expiry", 0)
+        liquid = [s for s in self.allowed_instruments if _LIQUID.get(s, False)]
+        
+        return (
+            np.isin(symbols, liquid)
+            & (self.min_vix <= vix) & (vix <= self.max_vix)
+            & (np.abs(column("index_chg_pct", 0.0)) < settings.get("DANGER_ZONE_WARNING", 1.0))
+            & (np.abs(column("trend_strength", 0.0)) < 1.5)
+            & ~column("is_expiry", False).astype(bool)
+            & (column("upcoming_events_len", 0) == 0)
+            & (self.min_days_to_expiry <= days_to_expiry) & (days_to_expiry <= self.max_days_to_expiry)
+        )
+
     def generate_orders(self, signal: Dict, config: Dict, lot_size: int) -> List[Dict[str, Any]]:
         """
         Generate Butterfly Spread orders with hedge-first execution:
@@ -98,77 +174,106 @@ class ButterflySpreadStrategy(BaseStrategy):
         if not wing_width:
             wing_width = self.wing_width_banknifty if symbol == "BANKNIFTY" else self.wing_width_nifty
         
+        # Strikes are whole index points; integer math keeps the equal-wing check exact
+        center_strike = int(center_strike)
+        wing_width = int(wing_width)
+        
         # Calculate strikes
         lower_strike = center_strike - wing_width
         upper_strike = center_strike + wing_width
         
-        # Validate butterfly structure
-        if not self._validate_butterfly_strikes(symbol, lower_strike, center_strike, upper_strike):
+        # Validate butterfly structure (ordered strikes, equal wings); strict mode
+        # additionally warns when the wing width is off the symbol's default
+        if config.get("strict_validation"):
+            valid = self._validate_butterfly_strikes(symbol, lower_strike, center_strike,
+                                                     upper_strike, strict=True)
+        else:
+            valid = (lower_strike < center_strike < upper_strike
+                     and center_strike - lower_strike == upper_strike - center_strike)
+        if not valid:
             raise ValueError(f"Invalid Butterfly Spread strike selection for {symbol}")
         
-        # Get instrument configuration
-        instrument_config = get_instrument_config(symbol)
-        lot_qty = instrument_config.get("lot_size", 50)
+        lot_qty = _lot_qty(symbol)
         
         # HEDGE-FIRST ORDER EXECUTION (for margin benefit)
-        orders = [
-            # 1. BUY Lower Strike (FIRST - hedge protection)
-            {
-                "symbol": f"{symbol}{expiry}{int(lower_strike)}{option_type}",
-                "side": "BUY",
-                "lots": lots,
-                "quantity": lots * lot_qty,
-                "leg_type": "long_lower",
-                "is_hedge": True,
-                "strike": lower_strike,
-                "option_type": option_type,
-                "expiry": expiry,
-                "priority": 1,  # Execute FIRST
-                "execution_order": "HEDGE_FIRST"
-            },
-            
-            # 2. BUY Upper Strike (SECOND - hedge protection)
-            {
-                "symbol": f"{symbol}{expiry}{int(upper_strike)}{option_type}",
-                "side": "BUY",
-                "lots": lots,
-                "quantity": lots * lot_qty,
-                "leg_type": "long_upper",
-                "is_hedge": True,
-                "strike": upper_strike,
-                "option_type": option_type,
-                "expiry": expiry,
-                "priority": 2,  # Execute SECOND
-                "execution_order": "HEDGE_FIRST"
-            },
-            
-            # 3. SELL Middle Strike (THIRD - after hedges in place)
-            {
-                "symbol": f"{symbol}{expiry}{int(center_strike)}{option_type}",
-                "side": "SELL",
-                "lots": 2 * lots,  # Sell 2x quantity
-                "quantity": 2 * lots * lot_qty,
-                "leg_type": "short_middle",
-                "is_hedge": False,
-                "strike": center_strike,
-                "option_type": option_type,
-                "expiry": expiry,
-                "priority": 3,  # Execute AFTER hedges
-                "execution_order": "MAIN_AFTER_HEDGE"
-            }
-        ]
+        orders = self._build_orders(symbol, expiry, option_type,
+                                    lower_strike, center_strike, upper_strike, lots, lot_qty)
+        
+        if logger.isEnabledFor(logging.INFO):
+            # Expected net debit is only needed for the log line
+            estimated_debit = signal.get("estimated_net_debit", 0)
+            logger.info("Generated Butterfly Spread for %s: %s %d/%d/%d, Wing Width: %d, "
+                        "Estimated Debit: ₹%s, HEDGE-FIRST execution for margin benefit",
+                        symbol, option_type, lower_strike, center_strike, upper_strike,
+                        wing_width, format(estimated_debit, ",.0f"))
+        
+        return orders
+
+    def generate_orders_batch(self, signals: List[Dict], config: Dict,
+                              lot_size: int) -> List[Dict[str, Any]]:
+        """
+        Generate Butterfly Spread orders for many signals in one call
+        
+        Strike math and validation run as one NumPy pass over all signals, and
+        instrument configuration is looked up once per symbol. Returns the
+        hedge-first legs of every signal as a single flat list.
+        """
+        if not signals:
+            return []
+        
+        lots = config.get("lot_count", 1)
+        # Strikes are whole index points, as in generate_orders
+        centers = np.array([signal["center_strike"] for signal in signals], dtype=np.int64)
+        widths = np.array([
+            signal.get("wing_width") or (
+                self.wing_width_banknifty if signal["symbol"] == "BANKNIFTY" else self.wing_width_nifty
+            )
+            for signal in signals
+        ], dtype=np.int64)
+        lowers = centers - widths
+        uppers = centers + widths
         
-        # Calculate expected net debit
-        estimated_debit = signal.get("estimated_net_debit", 0)
+        # Wings are equal by construction, so only a positive width is needed
+        invalid = np.flatnonzero(widths <= 0)
+        if invalid.size:
+            bad_symbols = sorted({signals[i]["symbol"] for i in invalid})
+            raise ValueError(f"Invalid Butterfly Spread strike selection for {bad_symbols} "
+                             f"(signal indexes {invalid.tolist()})")
         
-        logger.info(f"Generated Butterfly Spread for {symbol}: "
-                   f"{option_type} {lower_strike}/{center_strike}/{upper_strike}, "
-                   f"Wing Width: {wing_width}, "
-                   f"Estimated Debit: ₹{estimated_debit:,.0f}, "
-                   f"HEDGE-FIRST execution for margin benefit")
+        lot_qtys = {}
+        orders = []
+        for signal, lower, center, upper in zip(signals, lowers.tolist(), centers.tolist(), uppers.tolist()):
+            symbol = signal["symbol"]
+            if symbol not in lot_qtys:
+                lot_qtys[symbol] = _lot_qty(symbol)
+            orders.extend(self._build_orders(symbol, signal["expiry"], signal.get("option_type", "CE"),
+                                             lower, center, upper, lots, lot_qtys[symbol]))
+        
+        logger.info("Generated %d Butterfly Spreads (%d legs) for %s, HEDGE-FIRST execution",
+                    len(signals), len(orders), ", ".join(sorted(lot_qtys)))
         
         return orders
 
+    def _build_orders(self, symbol: str, expiry: str, option_type: str,
+                      lower_strike: float, center_strike: float, upper_strike: float,
+                      lots: int, lot_qty: int) -> List[Dict[str, Any]]:
+        """Fill the hedge-first leg templates for one butterfly"""
+        strikes = {"lower": lower_strike, "center": center_strike, "upper": upper_strike}
+        prefix = symbol + expiry
+        symbols = {key: f"{prefix}{int(strike)}{option_type}" for key, strike in strikes.items()}
+        return [
+            dict(
+                fixed,
+                symbol=symbols[strike_key],
+                lots=qty_mult * lots,
+                quantity=qty_mult * lots * lot_qty,
+                strike=strikes[strike_key],
+                option_type=option_type,
+                expiry=expiry
+            )
+            for strike_key, qty_mult, fixed in self._LEG_TEMPLATES
+        ]
+
     def on_mtm_tick(self, mtm: float, config: Dict, lot_count: int) -> Dict[str, Any]:
         """
         Butterfly Spread specific risk management:
@@ -182,61 +287,40 @@ class ButterflySpreadStrategy(BaseStrategy):
         days_to_expiry = config.get("days_to_expiry", 15)
         time_decay_benefit = days_to_expiry < 14  # Time decay helps after 2 weeks
         
+        # Explicit comparisons keep NaN MTM and zero/negative SL/TP on the no-action path
         if mtm <= -sl:
-            return {
-                "action": "HARD_STOP",
-                "reason": "Butterfly Spread SL triggered (max debit loss)",
-                "urgency": "HIGH"
-            }
-        elif mtm >= tp:
-            return {
-                "action": "TAKE_PROFIT",
-                "reason": "Butterfly Spread TP achieved",
-                "urgency": "MEDIUM"
-            }
-        elif days_to_expiry <= 5:
+            return _HARD_STOP
+        if mtm >= tp:
+            return _TAKE_PROFIT
+        if days_to_expiry <= 5:
             return {
                 "action": "EXPIRY_MANAGEMENT",
                 "reason": f"Close to expiry: {days_to_expiry} days remaining",
                 "urgency": "MEDIUM"
             }
-        elif mtm >= tp * 0.5 and time_decay_benefit:
-            return {
-                "action": "PROFIT_OPPORTUNITY",
-                "reason": f"50% max profit achieved with time decay benefit",
-                "urgency": "LOW"
-            }
-        elif mtm <= -sl * 0.8:
-            return {
-                "action": "SOFT_WARN",
-                "reason": "Approaching Butterfly Spread maximum loss",
-                "urgency": "MEDIUM"
-            }
+        if mtm >= tp * 0.5 and time_decay_benefit:
+            return _PROFIT_OPPORTUNITY
+        if mtm <= -sl * 0.8:
+            return _SOFT_WARN
         
-        return {"action": None}
+        return NO_ACTION
 
-    def _validate_butterfly_strikes(self, symbol: str, lower_strike: float,
-                                  center_strike: float, upper_strike: float) -> bool:
-        """Validate Butterfly Spread strike selection"""
-        
-        # Basic order validation
-        if not (lower_strike < center_strike < upper_strike):
-            logger.error(f"Invalid strike order: {lower_strike} < {center_strike} < {upper_strike}")
-            return False
-        
-        # Check equal wing distances
+    def _validate_butterfly_strikes(self, symbol: str, lower_strike: int,
+                                  center_strike: int, upper_strike: int,
+                                  strict: bool = False) -> bool:
+        """
+        Validate Butterfly Spread strike selection (ordered strikes, equal wings)
+        strict also warns when the wing width is outside 0.5x-2x of the symbol default
+        """
         lower_wing = center_strike - lower_strike
-        upper_wing = upper_strike - center_strike
-        
-        if lower_wing != upper_wing:
-            logger.error(f"Unequal wings: lower={lower_wing}, upper={upper_wing}")
+        if not (lower_strike < center_strike < upper_strike and lower_wing == upper_strike - center_strike):
+            logger.error("Invalid butterfly strikes: %s/%s/%s", lower_strike, center_strike, upper_strike)
             return False
         
-        # Check wing width is appropriate for symbol
-        expected_width = self.wing_width_banknifty if symbol == "BANKNIFTY" else self.wing_width_nifty
-        
-        if lower_wing < expected_width * 0.5 or lower_wing > expected_width * 2:
-            logger.warning(f"Wing width {lower_wing} outside optimal range for {symbol}")
+        if strict:
+            expected_width = self.wing_width_banknifty if symbol == "BANKNIFTY" else self.wing_width_nifty
+            if not expected_width * 0.5 <= lower_wing <= expected_width * 2:
+                logger.warning("Wing width %s outside optimal range for %s", lower_wing, symbol)
         
         return True
 
@@ -245,79 +329,43 @@ class ButterflySpreadStrategy(BaseStrategy):
         """
         Calculate optimal Butterfly Spread strikes
         """
-        # Center strike at or near ATM
         if symbol == "NIFTY":
-            center_strike = round(spot_price / 50) * 50  # Round to nearest 50
-            wing_width = self.wing_width_nifty
+            step, wing_width = 50, self.wing_width_nifty
         else:  # BANKNIFTY
-            center_strike = round(spot_price / 100) * 100  # Round to nearest 100
-            wing_width = self.wing_width_banknifty
-        
-        # Adjust center strike slightly based on option type and time
-        if option_type == "CE" and days_to_expiry > 20:
-            # Slightly OTM for call butterflies with more time
-            center_strike += wing_width * 0.5
-        elif option_type == "PE" and days_to_expiry > 20:
-            # Slightly OTM for put butterflies with more time
-            center_strike -= wing_width * 0.5
-        
-        # Ensure proper rounding
-        if symbol == "NIFTY":
-            center_strike = round(center_strike / 50) * 50
-        else:
-            center_strike = round(center_strike / 100) * 100
+            step, wing_width = 100, self.wing_width_banknifty
         
-        lower_strike = center_strike - wing_width
-        upper_strike = center_strike + wing_width
-        
-        return {
-            "lower_strike": lower_strike,
-            "center_strike": center_strike,
-            "upper_strike": upper_strike,
-            "wing_width": wing_width
-        }
+        # Every spot that rounds to the same ATM strike shares one cached result
+        return dict(_optimal_strikes_impl(round(spot_price / step), step, wing_width,
+                                          option_type, days_to_expiry > 20))
 
     def calculate_butterfly_payoff(self, strikes: Dict[str, float], 
-                                 spot_at_expiry: float, net_debit: float) -> float:
+                                 spot_at_expiry: Union[float, np.ndarray],
+                                 net_debit: float) -> Union[float, np.ndarray]:
         """
         Calculate Butterfly Spread payoff at expiry
+        spot_at_expiry may be an array of scenario spots, evaluated in one call
         """
         lower = strikes["lower_strike"]
         center = strikes["center_strike"]
         upper = strikes["upper_strike"]
         
-        if spot_at_expiry <= lower or spot_at_expiry >= upper:
-            # Outside the wings - maximum loss (net debit paid)
-            return -net_debit
-        elif spot_at_expiry == center:
-            # At center strike - maximum profit
-            wing_width = center - lower
-            return wing_width - net_debit
-        elif lower < spot_at_expiry < center:
-            # Between lower and center
-            intrinsic_value = spot_at_expiry - lower
-            return intrinsic_value - net_debit
-        else:  # center < spot_at_expiry < upper
-            # Between center and upper
-            intrinsic_value = upper - spot_at_expiry
-            return intrinsic_value - net_debit
+        if isinstance(spot_at_expiry, np.ndarray):
+            return _payoff_kernel(spot_at_expiry, lower, center, upper, net_debit)
+        
+        # Long 1 lower, short 2 center, long 1 upper: sum of the three call payoffs
+        return (
+            max(spot_at_expiry - lower, 0.0)
+            - 2.0 * max(spot_at_expiry - center, 0.0)
+            + max(spot_at_expiry - upper, 0.0)
+            - net_debit
+        )
 
     def get_breakeven_points(self, strikes: Dict[str, float], net_debit: float) -> Dict[str, float]:
         """
         Calculate Butterfly Spread breakeven points
         """
-        lower = strikes["lower_strike"]
-        center = strikes["center_strike"]
-        upper = strikes["upper_strike"]
-        
-        return {
-            "lower_breakeven": lower + net_debit,
-            "upper_breakeven": upper - net_debit,
-            "max_profit_point": center,
-            "max_profit_amount": (center - lower) - net_debit,
-            "max_loss_amount": net_debit,
-            "profit_range": f"{lower + net_debit:.0f} to {upper - net_debit:.0f}"
-        }
+        return dict(_breakeven_impl(int(strikes["lower_strike"]), int(strikes["center_strike"]),
+                                    int(strikes["upper_strike"]), net_debit))
 
     def _calculate_max_loss(self, orders: List[Dict[str, Any]], spot_price: float) -> float:
         """
@@ -331,14 +379,15 @@ class ButterflySpreadStrategy(BaseStrategy):
         Calculate maximum profit for Butterfly Spread
         Max profit = Wing width - Net debit paid
         """
-        # Get wing width from orders
-        strikes = []
-        for order in orders:
-            strikes.append(order.get("strike", 0))
-        
-        if len(strikes) >= 3:
-            strikes.sort()
-            wing_width = strikes[1] - strikes[0]  # Distance between strikes
+        # Get wing width from the known leg types, without sorting
+        by_type = {order.get("leg_type"): order.get("strike", 0) for order in orders}
+        if "short_middle" in by_type and "long_lower" in by_type:
+            return by_type["short_middle"] - by_type["long_lower"] - self.max_net_debit
+        
+        # Orders without leg types: lower-to-upper spans both (equal) wings
+        if len(orders) >= 3:
+            strikes = [order.get("strike", 0) for order in orders]
+            wing_width = (max(strikes) - min(strikes)) // 2
             return wing_width - self.max_net_debit
         
         return self.max_net_debit  # Conservative estimate
@@ -369,35 +418,41 @@ class ButterflySpreadStrategy(BaseStrategy):
         
         return {**base_metrics, **butterfly_metrics}
 
+# Expected side of each leg, in execution order (BUY, BUY, SELL)
+_HEDGE_FIRST_SIDES = tuple(fixed["side"] for _, _, fixed in ButterflySpreadStrategy._LEG_TEMPLATES)
+
 # Utility functions for Butterfly Spread analysis
 def validate_butterfly_spread_structure(orders: List[Dict[str, Any]]) -> bool:
     """Validate that orders represent proper Butterfly Spread structure"""
     if len(orders) != 3:  # Can be 3 legs if middle is 2x quantity
         return False
     
-    # Check quantities: should be 1-2-1 pattern
-    quantities = []
-    sides = []
+    # Should have 2 BUY and 1 SELL (with 2x quantity), counted in one pass
+    buy_count = sell_count = 0
     for order in orders:
-        quantities.append(order.get("lots", 1))
-        sides.append(order.get("side"))
-    
-    # Should have 2 BUY and 1 SELL (with 2x quantity)
-    buy_count = sides.count("BUY")
-    sell_count = sides.count("SELL")
+        side = order.get("side")
+        buy_count += side == "BUY"
+        sell_count += side == "SELL"
     
     return buy_count == 2 and sell_count == 1
 
-def calculate_butterfly_spread_greeks(strikes: Dict[str, float], spot_price: float,
-                                    days_to_expiry: int, volatility: float) -> Dict[str, float]:
+def calculate_butterfly_spread_greeks(strikes: Dict[str, float],
+                                    spot_price: Union[float, np.ndarray],
+                                    days_to_expiry: Union[int, np.ndarray],
+                                    volatility: Union[float, np.ndarray]) -> Dict[str, Any]:
     """
     Calculate approximate Greeks for Butterfly Spread
     (Simplified calculation - would use Black-Scholes in production)
+    Array inputs broadcast together and return one array per Greek
     """
-    # Simplified Greeks calculation
     center = strikes["center_strike"]
     wing_width = strikes["upper_strike"] - strikes["center_strike"]
     
+    if any(isinstance(x, np.ndarray) for x in (spot_price, days_to_expiry, volatility)):
+        delta, gamma, theta, vega = _greeks_kernel(spot_price, days_to_expiry, volatility,
+                                                   center, wing_width)
+        return {"delta": delta, "gamma": gamma, "theta": theta, "vega": vega}
+    
     # Delta approximately zero at center strike
     delta = 0.0 if abs(spot_price - center) < wing_width * 0.1 else 0.1
     
@@ -417,24 +472,106 @@ def calculate_butterfly_spread_greeks(strikes: Dict[str, float], spot_price: flo
         "vega": vega
     }
 
-def check_butterfly_hedge_first_execution(orders: List[Dict[str, Any]]) -> bool:
-    """Verify that long options (hedges) are executed before short options"""
-    long_orders = [o for o in orders if o.get("side") == "BUY"]
-    short_orders = [o for o in orders if o.get("side") == "SELL"]
+@lru_cache(maxsize=2048)
+def _optimal_strikes_impl(atm_units: int, step: int, wing_width: int,
+                          option_type: str, long_dated: bool) -> Dict[str, float]:
+    """Cached strike selection keyed on the rounded ATM strike (in strike steps)"""
+    # Center strike at or near ATM
+    center_strike = atm_units * step
     
-    if not long_orders or not short_orders:
-        return False
+    # Adjust center strike slightly based on option type and time
+    if option_type == "CE" and long_dated:
+        # Slightly OTM for call butterflies with more time
+        center_strike += wing_width * 0.5
+    elif option_type == "PE" and long_dated:
+        # Slightly OTM for put butterflies with more time
+        center_strike -= wing_width * 0.5
     
-    # Check that all long orders have lower priority numbers (execute first)
-    min_long_priority = min(o.get("priority", 999) for o in long_orders)
-    min_short_priority = min(o.get("priority", 999) for o in short_orders)
+    # Ensure proper rounding
+    center_strike = round(center_strike / step) * step
     
-    return min_long_priority < min_short_priority
+    return {
+        "lower_strike": center_strike - wing_width,
+        "center_strike": center_strike,
+        "upper_strike": center_strike + wing_width,
+        "wing_width": wing_width
+    }
+
+@lru_cache(maxsize=2048)
+def _breakeven_impl(lower: int, center: int, upper: int, net_debit: float) -> Dict[str, Any]:
+    """Cached breakeven table; callers receive a copy"""
+    return {
+        "lower_breakeven": lower + net_debit,
+        "upper_breakeven": upper - net_debit,
+        "max_profit_point": center,
+        "max_profit_amount": (center - lower) - net_debit,
+        "max_loss_amount": net_debit,
+        "profit_range": f"{lower + net_debit:.0f} to {upper - net_debit:.0f}"
+    }
+
+# Scenario kernels are compositions of NumPy ufuncs, which ship precompiled, so
+# the first call of the day pays no JIT/compile warmup and no build step is needed
+def _payoff_kernel(spot: np.ndarray, lower: float, center: float, upper: float,
+                   net_debit: float) -> np.ndarray:
+    """Vectorized expiry payoff over an array of scenario spots"""
+    return (
+        np.maximum(spot - lower, 0.0)
+        - 2.0 * np.maximum(spot - center, 0.0)
+        + np.maximum(spot - upper, 0.0)
+        - net_debit
+    )
+
+def _greeks_kernel(spot: np.ndarray, days_to_expiry: np.ndarray, volatility: np.ndarray,
+                   center: float, wing_width: float) -> Tuple[np.ndarray, ...]:
+    """Vectorized simplified Greeks, broadcasting spot/DTE/volatility scenario grids"""
+    distance = np.abs(np.asarray(spot, dtype=float) - center)
+    delta = np.where(distance < wing_width * 0.1, 0.0, 0.1)
+    gamma = np.where(distance < wing_width, 1.0 / wing_width, 0.1)
+    theta = 0.5 * np.asarray(days_to_expiry, dtype=float) / 30.0
+    vega = -0.3 * np.asarray(volatility, dtype=float) / 20.0
+    return np.broadcast_arrays(delta, gamma, theta, vega)
+
+def payoff_grid(strikes_soa: Dict[str, np.ndarray], spot_grid: np.ndarray,
+                net_debit: Union[float, np.ndarray],
+                out: Optional[np.ndarray] = None,
+                dtype: np.dtype = np.float32) -> np.ndarray:
+    """
+    Expiry payoff for many butterflies over a grid of spots
+    strikes_soa holds "lower"/"center"/"upper" arrays (one entry per butterfly);
+    the result has shape (len(spot_grid), n_butterflies). Pass a preallocated
+    buffer of the same dtype as out= to reuse it across scenario refreshes.
+    Grids are float32 by default (strikes are exact, payoffs are per-unit
+    rupees); cast to float64 before summing P&L across large grids.
+    """
+    spots = np.ascontiguousarray(spot_grid, dtype=dtype)[:, None]
+    lower = np.asarray(strikes_soa["lower"], dtype=dtype)
+    center = np.asarray(strikes_soa["center"], dtype=dtype)
+    upper = np.asarray(strikes_soa["upper"], dtype=dtype)
+    
+    if out is None:
+        out = np.empty((spots.shape[0], lower.shape[0]), dtype=dtype)
+    
+    # Same identity as _payoff_kernel, accumulated in place into out
+    np.subtract(spots, lower, out=out)
+    np.maximum(out, 0, out=out)
+    out -= 2 * np.maximum(spots - center, 0)
+    out += np.maximum(spots - upper, 0)
+    out -= np.asarray(net_debit, dtype=dtype)
+    return out
+
+def check_butterfly_hedge_first_execution(orders: List[Dict[str, Any]]) -> bool:
+    """Verify that long options (hedges) are executed before short options"""
+    # List position is execution order: every butterfly must run BUY, BUY, SELL
+    legs = len(_HEDGE_FIRST_SIDES)
+    if not orders or len(orders) % legs:
+        return False
+    return all(order.get("side") == _HEDGE_FIRST_SIDES[i % legs] for i, order in enumerate(orders))
 
 # Export the strategy class and utilities
 __all__ = [
     "ButterflySpreadStrategy",
     "validate_butterfly_spread_structure",
     "calculate_butterfly_spread_greeks",
-    "check_butterfly_hedge_first_execution"
+    "check_butterfly_hedge_first_execution",
+    "payoff_grid"
 ]
@@ -7,13 +7,204 @@ Calendar Spread Strategy - F&O (NIFTY/BANKNIFTY) | 4-leg time decay strategy
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
-from app.strategies.base import BaseStrategy
+from typing import Dict, List, Any, Callable, Iterator, NamedTuple, Sequence, Tuple, Union
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from functools import lru_cache
+from app.strategies.base import BaseStrategy, NO_ACTION
 from app.config import StrategyType, get_instrument_config
+import math
+import sys
+import numpy as np
 import logging
 
 logger = logging.getLogger("CalendarSpreadStrategy")
 
+# Interned leg field values shared by every generated order
+BUY = sys.intern("BUY")
+SELL = sys.intern("SELL")
+CE = sys.intern("CE")
+PE = sys.intern("PE")
+SHORT_NEAR = sys.intern("short_near")
+LONG_FAR = sys.intern("long_far")
+
+# Descriptive part of get_strategy_specific_metrics; does not depend on parameters
+_PROFILE_METRICS = MappingProxyType({
+    "theta_strategy": True,
+    "volatility_sensitive": True,
+    "best_market_conditions": "Low volatility, sideways movement"
+})
+
+# Valid strike interval per instrument
+_STRIKE_STEP = {"NIFTY": 50, "BANKNIFTY": 100}
+
+@lru_cache(maxsize=8)
+def _lot_qty(symbol: str) -> int:
+    """Lot size per instrument; instrument config is fixed for the process lifetime"""
+    return get_instrument_config(symbol).get("lot_size", 50)
+
+# Shared read-only on_mtm_tick results (VOLATILITY_EXIT carries live VIX values)
+_HARD_STOP = MappingProxyType({
+    "action": "HARD_STOP",
+    "reason": "Calendar Spread SL triggered",
+    "urgency": "HIGH"
+})
+_TAKE_PROFIT = MappingProxyType({
+    "action": "TAKE_PROFIT",
+    "reason": "Calendar Spread TP achieved",
+    "urgency": "MEDIUM"
+})
+_SOFT_WARN = MappingProxyType({
+    "action": "SOFT_WARN",
+    "reason": "Approaching Calendar Spread SL",
+    "urgency": "MEDIUM"
+})
+
+@dataclass(slots=True, frozen=True)
+class CalendarSignal:
+    """Typed calendar spread entry signal (generate_orders also accepts the dict form)"""
+    symbol: str
+    atm_strike: float
+    near_expiry: str            # e.g., "25JUL"
+    far_expiry: str             # e.g., "29AUG"
+    strike_adjustment: int = 0  # +/- from ATM
+    near_dte: int = 7
+    far_dte: int = 30
+    
+    @classmethod
+    def coerce(cls, signal: Union[Dict, "CalendarSignal"]) -> "CalendarSignal":
+        """Return signal as a CalendarSignal, converting a legacy signal dict"""
+        if isinstance(signal, cls):
+            return signal
+        return cls(
+            symbol=signal["symbol"],
+            atm_strike=signal["atm_strike"],
+            near_expiry=signal["near_expiry"],
+            far_expiry=signal["far_expiry"],
+            strike_adjustment=signal.get("strike_adjustment", 0),
+            near_dte=signal.get("near_dte", 7),
+            far_dte=signal.get("far_dte", 30)
+        )
+
+@dataclass(slots=True, frozen=True)
+class CalendarRiskConfig:
+    """Typed position/risk config (generate_orders and on_mtm_tick also accept the dict form)"""
+    lot_count: int = 1
+    sl_per_lot: float = 1500
+    tp_per_lot: float = 3000
+    entry_vix: float = 20
+    current_vix: float = 20
+    
+    @classmethod
+    def coerce(cls, config: Union[Dict, "CalendarRiskConfig"]) -> "CalendarRiskConfig":
+        """Return config as a CalendarRiskConfig, converting a legacy config dict"""
+        if isinstance(config, cls):
+            return config
+        return cls(
+            lot_count=config.get("lot_count", 1),
+            sl_per_lot=config.get("sl_per_lot", 1500),
+            tp_per_lot=config.get("tp_per_lot", 3000),
+            entry_vix=config.get("entry_vix", 20),
+            current_vix=config.get("current_vix", 20)
+        )
+
+# check_near_expiry_management rules, tightest first:
+# (max near-leg DTE, action, urgency, suggested action)
+_NEAR_EXPIRY_RULES = (
+    (2, "NEAR_EXPIRY_EXIT", "HIGH", "Close entire position or roll near leg"),
+    (5, "NEAR_EXPIRY_WARN", "MEDIUM", "Monitor closely or consider early exit")
+)
+
+@lru_cache(maxsize=64)
+def _near_expiry_response(near_expiry_dte: int, action: str, urgency: str,
+                          suggested_action: str) -> MappingProxyType:
+    """Shared read-only near-expiry response; only a few DTE values ever occur"""
+    return MappingProxyType({
+        "action": action,
+        "reason": f"Near leg expires in {near_expiry_dte} days",
+        "urgency": urgency,
+        "suggested_action": suggested_action
+    })
+
+class RiskLevels(NamedTuple):
+    """MTM thresholds for one position"""
+    lot_count: int
+    stop_loss: float     # Hard stop at mtm <= stop_loss
+    take_profit: float   # Take profit at mtm >= take_profit
+    soft_stop: float     # Warning at mtm <= soft_stop
+    entry_vix: float
+    vix_trigger: float   # Volatility exit above this VIX
+
+@lru_cache(maxsize=256)
+def _risk_levels(sl_per_lot: float, tp_per_lot: float, entry_vix: float,
+                 lot_count: int) -> RiskLevels:
+    """MTM thresholds keyed on the values they derive from; few positions are live at once"""
+    sl = sl_per_lot * lot_count  # Conservative SL
+    tp = tp_per_lot * lot_count  # Conservative TP
+    return RiskLevels(
+        lot_count=lot_count,
+        stop_loss=-sl,
+        take_profit=tp,
+        soft_stop=-0.85 * sl,
+        entry_vix=entry_vix,
+        vix_trigger=entry_vix * 1.4  # 40% VIX increase
+    )
+
+@dataclass(slots=True, frozen=True)
+class CalendarLegs:
+    """
+    Calendar spread legs as parallel columns (one entry per leg, in execution order)
+    Risk/P&L code can work on the ndarray columns directly; iterating yields the
+    per-leg order dicts produced by generate_orders.
+    """
+    symbols: Tuple[str, ...]
+    sides: Tuple[str, ...]
+    leg_types: Tuple[str, ...]
+    option_types: Tuple[str, ...]
+    expiries: Tuple[str, ...]
+    lots: np.ndarray          # int32
+    quantities: np.ndarray    # int32
+    strikes: np.ndarray       # float64
+    is_hedge: np.ndarray      # bool
+    ttes: np.ndarray          # int32, days to expiry of each leg
+    
+    @classmethod
+    def from_orders(cls, orders: Sequence[Dict[str, Any]]) -> "CalendarLegs":
+        """Build the columns from generate_orders output"""
+        return cls(
+            symbols=tuple(o["symbol"] for o in orders),
+            sides=tuple(o["side"] for o in orders),
+            leg_types=tuple(o["leg_type"] for o in orders),
+            option_types=tuple(o["option_type"] for o in orders),
+            expiries=tuple(o["expiry"] for o in orders),
+            lots=np.array([o["lots"] for o in orders], dtype=np.int32),
+            quantities=np.array([o["quantity"] for o in orders], dtype=np.int32),
+            strikes=np.array([o["strike"] for o in orders], dtype=np.float64),
+            is_hedge=np.array([o["is_hedge"] for o in orders], dtype=bool),
+            ttes=np.array([o["time_to_expiry"] for o in orders], dtype=np.int32)
+        )
+    
+    def __len__(self) -> int:
+        return len(self.symbols)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i, (symbol, lots, quantity, strike, is_hedge, tte) in enumerate(zip(
+                self.symbols, self.lots.tolist(), self.quantities.tolist(),
+                self.strikes.tolist(), self.is_hedge.tolist(), self.ttes.tolist())):
+            yield {
+                "symbol": symbol,
+                "side": self.sides[i],
+                "lots": lots,
+                "quantity": quantity,
+                "leg_type": self.leg_types[i],
+                "is_hedge": is_hedge,
+                "expiry": self.expiries[i],
+                "strike": strike,
+                "option_type": self.option_types[i],
+                "time_to_expiry": tte
+            }
+
 class CalendarSpreadStrategy(BaseStrategy):
     """
     Calendar Spread Strategy (Time Spread)
@@ -21,6 +212,10 @@ class CalendarSpreadStrategy(BaseStrategy):
     - Buy far-term options (monthly expiry) 
     - Same strikes, profits from time decay differential
     - Works best in low-moderate volatility environments
+    
+    For brokers that accept multi-leg orders, the OMS should submit
+    build_multileg_payload(orders) as one request instead of placing the
+    four legs one by one.
     """
 
     name = "CALENDAR_SPREAD"
@@ -31,13 +226,17 @@ class CalendarSpreadStrategy(BaseStrategy):
         super().__init__()
         self.min_vix = 12.0  # Minimum VIX for entry
         self.max_vix = 28.0  # Maximum VIX for entry
-        self.target_win_rate = 80per_trade = 3000.0  # Conservative risk
+        self.target_win_rate = 80.0  # Target win rate
+        self.max_loss_per_trade = 3000.0  # Conservative risk
         
         # Calendar spread specific parameters
         self.min_time_spread = 7   # Minimum days between expiries
         self.max_time_spread = 45  # Maximum days between expiries
         self.preferred_dte_near = 7   # Days to expiry for near leg
         self.preferred_dte_far = 30   # Days to expiry for far leg
+        
+        # Per-instrument order builders (see _make_builder); others are added on first use
+        self._builders = {symbol: self._make_builder(symbol) for symbol in self.allowed_instruments}
 
     def evaluate_market_conditions(self, market_data: Dict, settings: Dict) -> bool:
         """
@@ -48,30 +247,46 @@ class CalendarSpreadStrategy(BaseStrategy):
         - Sufficient time spread available
         - Market in sideways to slightly trending mode
         """
-        symbol = market_data.get("symbol")
-        vix = market_data.get("vix", 0)
-        index_chg = abs(market_data.get("index_chg_pct", 0))
-        events = market_data.get("upcoming_events", [])
-        expiry = market_data.get("is_expiry", False)
-        trend_strength = market_data.get("trend_strength", 0)
+        # Cheapest and most discriminating checks first; missing VIX or near-expiry
+        # DTE fail the range checks below exactly as their 0 defaults would
+        if market_data.get("symbol") not in self._allowed_set:
+            return False
+        if market_data.get("is_expiry", False) or market_data.get("upcoming_events"):
+            return False
+        if "vix" not in market_data or not self.min_vix <= market_data["vix"] <= self.max_vix:
+            return False
         
-        # Available expiry dates check
+        # Available expiry dates check; don't enter too close to near expiry
         near_expiry_dte = market_data.get("near_expiry_dte", 0)
-        far_expiry_dte = market_data.get("far_expiry_dte", 0)
-        time_spread = far_expiry_dte - near_expiry_dte
+        if near_expiry_dte < 5:
+            return False
+        time_spread = market_data.get("far_expiry_dte", 0) - near_expiry_dte
         
         return (
-            symbol in self.allowed_instruments and
-            self.min_vix <= vix <= self.max_vix and
-            index_chg < settings.get("DANGER_ZONE_WARNING", 1.0) and
-            not expiry and
-            not events and
-            abs(trend_strength) < 2.0 and  # Not strongly trending
             self.min_time_spread <= time_spread <= self.max_time_spread and
-            near_expiry_dte >= 5  # Don't enter too close to near expiry
+            abs(market_data.get("trend_strength", 0)) < 2.0 and  # Not strongly trending
+            abs(market_data.get("index_chg_pct", 0)) < settings.get("DANGER_ZONE_WARNING", 1.0)
         )
 
-    def generate_orders(self, signal: Dict, config: Dict, lot_size: int) -> List[Dict[str, Any]]:
+    def evaluate_batch(self, market_data_list: Sequence[Dict], settings: Dict,
+                       workers: int = 1) -> np.ndarray:
+        """
+        evaluate_market_conditions over many candidate snapshots, as a boolean mask
+        The predicate holds the GIL, so evaluation is sequential by default; pass
+        workers > 1 to fan out on threads when snapshots are IO-backed (lazy quotes)
+        """
+        if workers > 1 and len(market_data_list) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    lambda market_data: self.evaluate_market_conditions(market_data, settings),
+                    market_data_list
+                ))
+        else:
+            results = [self.evaluate_market_conditions(md, settings) for md in market_data_list]
+        return np.array(results, dtype=bool)
+
+    def generate_orders(self, signal: Union[Dict, CalendarSignal],
+                        config: Union[Dict, CalendarRiskConfig], lot_size: int) -> Tuple[Dict[str, Any], ...]:
         """
         Generate calendar spread orders:
         - Sell weekly CE + PE (same strikes, near expiry)
@@ -83,127 +298,132 @@ class CalendarSpreadStrategy(BaseStrategy):
         - near_expiry: Near term expiry date
         - far_expiry: Far term expiry date
         - strike_adjustment: Strike adjustment from ATM (default 0)
+        Either may be passed as a dict or as CalendarSignal / CalendarRiskConfig.
         """
-        symbol = signal["symbol"]
-        atm_strike = signal["atm_strike"]
-        near_expiry = signal["near_expiry"]  # e.g., "25JUL"
-        far_expiry = signal["far_expiry"]    # e.g., "29AUG"
-        strike_adj = signal.get("strike_adjustment", 0)  # +/- from ATM
-        lots = config.get("lot_count", 1)
-        
-        # Get lot size for the instrument
-        instrument_config = get_instrument_config(symbol)
-        lot_qty = instrument_config.get("lot_size", 50)
+        sig = CalendarSignal.coerce(signal)
+        symbol = sig.symbol
+        lots = CalendarRiskConfig.coerce(config).lot_count
         
-        # Calculate the actual strike to use
-        target_strike = atm_strike + strike_adj
+        builder = self._builders.get(symbol)
+        if builder is None:
+            builder = self._builders[symbol] = self._make_builder(symbol)
+        orders = builder(sig, lots)
         
-        # Ensure strike is rounded to valid strikes
-        if symbol == "NIFTY":
-            target_strike = round(target_strike / 50) * 50  # Round to nearest 50
-        elif symbol == "BANKNIFTY":
-            target_strike = round(target_strike / 100) * 100  # Round to nearest 100
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Generated Calendar Spread for %s at strike %s: Short %s, Long %s",
+                        symbol, orders[0]["strike"], sig.near_expiry, sig.far_expiry)
+        return orders
+
+    def _make_builder(self, symbol: str) -> Callable[[CalendarSignal, int], Tuple[Dict[str, Any], ...]]:
+        """
+        Order builder specialized for one instrument, with its strike step and
+        lot size bound once instead of looked up per signal
+        """
+        step = _STRIKE_STEP.get(symbol)  # None: strike used as given
+        lot_qty = _lot_qty(symbol)
         
-        orders = [
-            # SELL near-term Call (weekly)
-            {
-                "symbol": f"{symbol}{near_expiry}{int(target_strike)}CE",
-                "side": "SELL",
-                "lots": lots,
-                "quantity": lots * lot_qty,
-                "leg_type": "short_near",
-                "is_hedge": False,
-                "expiry": near_expiry,
-                "strike": target_strike,
-                "option_type": "CE",
-                "time_to_expiry": signal.get("near_dte", 7)
-            },
-            # BUY far-term Call (monthly) - HEDGE
-            {
-                "symbol": f"{symbol}{far_expiry}{int(target_strike)}CE",
-                "side": "BUY",
-                "lots": lots,
-                "quantity": lots * lot_qty,
-                "leg_type": "long_far",
-                "is_hedge": True,
-                "expiry": far_expiry,
-                "strike": target_strike,
-                "option_type": "CE", 
-                "time_to_expiry": signal.get("far_dte", 30)
-            },
-            # SELL near-term Put (weekly)
-            {
-                "symbol": f"{symbol}{near_expiry}{int(target_strike)}PE",
-                "side": "SELL",
-                "lots": lots,
-                "quantity": lots * lot_qty,
-                "leg_type": "short_near",
-                "is_hedge": False,
-                "expiry": near_expiry,
-                "strike": target_strike,
-                "option_type": "PE",
-                "time_to_expiry": signal.get("near_dte", 7)
-            },
-            # BUY far-term Put (monthly) - HEDGE
-            {
-                "symbol": f"{symbol}{far_expiry}{int(target_strike)}PE",
-                "side": "BUY",
-                "lots": lots,
-                "quantity": lots * lot_qty,
-                "leg_type": "long_far",
-                "is_hedge": True,
-                "expiry": far_expiry,
-                "strike": target_strike,
-                "option_type": "PE",
-                "time_to_expiry": signal.get("far_dte", 30)
-            }
-        ]
+        def build(sig: CalendarSignal, lots: int) -> Tuple[Dict[str, Any], ...]:
+            near_expiry = sig.near_expiry
+            far_expiry = sig.far_expiry
+            
+            # Calculate the actual strike, rounded to valid strikes (nearest 50 / 100)
+            target_strike = sig.atm_strike + sig.strike_adjustment
+            if step:
+                target_strike = round(target_strike / step) * step
+            
+            # Contract symbols share the expiry/strike prefix; the static fields of the
+            # near and far legs are built once and only symbol/option type vary per leg
+            strike_int = int(target_strike)
+            near_prefix = f"{symbol}{near_expiry}{strike_int}"
+            far_prefix = f"{symbol}{far_expiry}{strike_int}"
+            quantity = lots * lot_qty
+            near_leg = {"lots": lots, "quantity": quantity, "strike": target_strike,
+                        "side": SELL, "leg_type": SHORT_NEAR, "is_hedge": False,
+                        "expiry": near_expiry, "time_to_expiry": sig.near_dte}
+            far_leg = {"lots": lots, "quantity": quantity, "strike": target_strike,
+                       "side": BUY, "leg_type": LONG_FAR, "is_hedge": True,
+                       "expiry": far_expiry, "time_to_expiry": sig.far_dte}
+            
+            # Fixed four-leg structure, returned as an immutable tuple
+            return (
+                # SELL near-term Call (weekly)
+                {**near_leg, "symbol": near_prefix + CE, "option_type": CE},
+                # BUY far-term Call (monthly) - HEDGE
+                {**far_leg, "symbol": far_prefix + CE, "option_type": CE},
+                # SELL near-term Put (weekly)
+                {**near_leg, "symbol": near_prefix + PE, "option_type": PE},
+                # BUY far-term Put (monthly) - HEDGE
+                {**far_leg, "symbol": far_prefix + PE, "option_type": PE}
+            )
         
-        logger.info(f"Generated Calendar Spread for {symbol} at strike {target_strike}: "
-                   f"Short {near_expiry}, Long {far_expiry}")
-        return orders
+        return build
+
+    def generate_legs(self, signal: Union[Dict, CalendarSignal],
+                      config: Union[Dict, CalendarRiskConfig], lot_size: int) -> CalendarLegs:
+        """generate_orders as struct-of-arrays columns, for vectorized downstream use"""
+        return CalendarLegs.from_orders(self.generate_orders(signal, config, lot_size))
+
+    def build_multileg_payload(self, orders: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Single multi-leg request body for the generated legs (one broker round trip
+        per spread instead of one per leg); legs keep generate_orders order
+        """
+        return {
+            "variety": "MULTILEG",
+            "legs": [
+                {
+                    "tradingsymbol": order["symbol"],
+                    "transaction_type": order["side"],
+                    "quantity": order["quantity"]
+                }
+                for order in orders
+            ]
+        }
 
-    def on_mtm_tick(self, mtm: float, config: Dict, lot_count: int) -> Dict[str, Any]:
+    def prepare_risk_levels(self, config: Union[Dict, CalendarRiskConfig],
+                            lot_count: int) -> RiskLevels:
+        """
+        MTM thresholds on_mtm_tick applies for this config and lot count
+        Levels are cached per (SL, TP, entry VIX, lot count), so repeated ticks of a
+        position reuse them and in-place config changes take effect on the next tick.
+        """
+        risk = CalendarRiskConfig.coerce(config)
+        return _risk_levels(risk.sl_per_lot, risk.tp_per_lot, risk.entry_vix, lot_count)
+
+    def on_mtm_tick(self, mtm: float, config: Union[Dict, CalendarRiskConfig],
+                    lot_count: int) -> Dict[str, Any]:
         """
         Calendar Spread specific risk management:
         - More conservative SL/TP due to time decay nature
         - Early exit if volatility spikes significantly
         - Profit taking when theta advantage is captured
         """
-        sl = config.get("sl_per_lot", 1500) * lot_count  # Conservative SL
-        tp = config.get("tp_per_lot", 3000) * lot_count  # Conservative TP
+        if isinstance(config, CalendarRiskConfig):
+            levels = _risk_levels(config.sl_per_lot, config.tp_per_lot, config.entry_vix, lot_count)
+        else:
+            levels = _risk_levels(config.get("sl_per_lot", 1500), config.get("tp_per_lot", 3000),
+                                  config.get("entry_vix", 20), lot_count)
         
-        # Check current conditions for early exit
-        current_vix = config.get("current_vix", 20)
-        entry_vix = config.get("entry_vix", 20)
-        vix_spike = current_vix > entry_vix * 1.4  # 40% VIX increase
+        if mtm <= levels.stop_loss:
+            return _HARD_STOP
+        if mtm >= levels.take_profit:
+            return _TAKE_PROFIT
         
-        if mtm <= -sl:
-            return {
-                "action": "HARD_STOP",
-                "reason": "Calendar Spread SL triggered",
-                "urgency": "HIGH"
-            }
-        elif mtm >= tp:
-            return {
-                "action": "TAKE_PROFIT", 
-                "reason": "Calendar Spread TP achieved",
-                "urgency": "MEDIUM"
-            }
-        elif vix_spike:
+        # Check current conditions for early exit
+        if isinstance(config, CalendarRiskConfig):
+            current_vix = config.current_vix
+        else:
+            current_vix = config.get("current_vix", 20)
+        if current_vix > levels.vix_trigger:
             return {
                 "action": "VOLATILITY_EXIT",
-                "reason": f"VIX spiked from {entry_vix:.1f} to {current_vix:.1f}",
+                "reason": f"VIX spiked from {levels.entry_vix:.1f} to {current_vix:.1f}",
                 "urgency": "HIGH"
             }
-        elif mtm <= -0.85 * sl:
-            return {
-                "action": "SOFT_WARN",
-                "reason": "Approaching Calendar Spread SL",
-                "urgency": "MEDIUM"
-            }
+        if mtm <= levels.soft_stop:
+            return _SOFT_WARN
         
-        return {"action": None}
+        return NO_ACTION
 
     def check_near_expiry_management(self, current_data: Dict, entry_data: Dict) -> Dict[str, Any]:
         """
@@ -212,22 +432,11 @@ class CalendarSpreadStrategy(BaseStrategy):
         near_expiry_dte = current_data.get("near_expiry_dte", 10)
         
         # Close or roll the near leg when it gets too close to expiry
-        if near_expiry_dte <= 2:
-            return {
-                "action": "NEAR_EXPIRY_EXIT",
-                "reason": f"Near leg expires in {near_expiry_dte} days",
-                "urgency": "HIGH",
-                "suggested_action": "Close entire position or roll near leg"
-            }
-        elif near_expiry_dte <= 5:
-            return {
-                "action": "NEAR_EXPIRY_WARN",
-                "reason": f"Near leg expires in {near_expiry_dte} days", 
-                "urgency": "MEDIUM",
-                "suggested_action": "Monitor closely or consider early exit"
-            }
+        for max_dte, action, urgency, suggested_action in _NEAR_EXPIRY_RULES:
+            if near_expiry_dte <= max_dte:
+                return _near_expiry_response(near_expiry_dte, action, urgency, suggested_action)
         
-        return {"action": None}
+        return NO_ACTION
 
     def calculate_theta_advantage(self, near_leg_theta: float, far_leg_theta: float) -> float:
         """
@@ -263,19 +472,29 @@ class CalendarSpreadStrategy(BaseStrategy):
         """
         base_metrics = self.get_strategy_info()
         
+        # Base info carries live state (is_active) and the same vix_range; tunable
+        # parameters are read per call, so only the descriptive profile is shared
         calendar_metrics = {
             "min_time_spread_days": self.min_time_spread,
             "max_time_spread_days": self.max_time_spread,
             "preferred_near_dte": self.preferred_dte_near,
             "preferred_far_dte": self.preferred_dte_far,
-            "vix_range": {"min": self.min_vix, "max": self.max_vix},
-            "theta_strategy": True,
-            "volatility_sensitive": True,
-            "best_market_conditions": "Low volatility, sideways movement"
+            **_PROFILE_METRICS
         }
         
         return {**base_metrics, **calendar_metrics}
 
+def calculate_theta_advantage_batch(near_thetas: np.ndarray, far_thetas: np.ndarray) -> np.ndarray:
+    """
+    Vectorized CalendarSpreadStrategy.calculate_theta_advantage for many positions
+    Short near, long far; sum the result for portfolio-level theta advantage
+    """
+    return -np.asarray(near_thetas, dtype=np.float64) - np.asarray(far_thetas, dtype=np.float64)
+
+# Bit per calendar leg kind, used by validate_calendar_structure
+_LEG_BITS = {(CE, BUY): 1, (CE, SELL): 2, (PE, BUY): 4, (PE, SELL): 8}
+_ALL_LEG_BITS = 0b1111
+
 # Utility functions for calendar spread analysis
 def calculate_time_decay_advantage(near_days: int, far_days: int, 
                                  current_iv: float) -> float:
@@ -287,8 +506,8 @@ def calculate_time_decay_advantage(near_days: int, far_days: int,
         return 0.0
     
     # Time decay accelerates as expiry approaches (non-linear)
-    near_decay_rate = 1.0 / (near_days ** 0.5)
-    far_decay_rate = 1.0 / (far_days ** 0.5)
+    near_decay_rate = 1.0 / math.sqrt(near_days)
+    far_decay_rate = 1.0 / math.sqrt(far_days)
     
     # Account for implied volatility impact
     iv_factor = min(2.0, max(0.5, current_iv / 20.0))  # Normalize around 20% IV
@@ -296,30 +515,55 @@ def calculate_time_decay_advantage(near_days: int, far_days: int,
     time_advantage = (near_decay_rate - far_decay_rate) * iv_factor
     return max(0.0, time_advantage)
 
-def validate_calendar_structure(orders: List[Dict[str, Any]]) -> bool:
+def calculate_time_decay_advantage_batch(near_days: np.ndarray, far_days: np.ndarray,
+                                         current_iv: np.ndarray) -> np.ndarray:
     """
-    Validate that orders represent a proper calendar spread structure
+    Vectorized calculate_time_decay_advantage over many (near, far, IV) candidates
+    Inputs broadcast together; invalid pairs (near <= 0 or far <= near) score 0.0
     """
-    if len(orders) != 4:
-        return False
+    near_days, far_days, current_iv = np.broadcast_arrays(
+        np.asarray(near_days, dtype=np.float64),
+        np.asarray(far_days, dtype=np.float64),
+        np.asarray(current_iv, dtype=np.float64)
+    )
+    valid = (near_days > 0) & (far_days > near_days)
     
-    # Check that we have both calls and puts
-    calls = [o for o in orders if o.get("option_type") == "CE"]
-    puts = [o for o in orders if o.get("option_type") == "PE"]
+    # Decay rates only for valid pairs, so no sqrt/division of non-positive days
+    near_decay_rate = np.zeros(near_days.shape)
+    far_decay_rate = np.zeros(far_days.shape)
+    np.sqrt(near_days, out=near_decay_rate, where=valid)
+    np.sqrt(far_days, out=far_decay_rate, where=valid)
+    np.divide(1.0, near_decay_rate, out=near_decay_rate, where=valid)
+    np.divide(1.0, far_decay_rate, out=far_decay_rate, where=valid)
     
-    if len(calls) != 2 or len(puts) != 2:
+    iv_factor = np.clip(current_iv / 20.0, 0.5, 2.0)  # Normalize around 20% IV
+    
+    return np.maximum(0.0, (near_decay_rate - far_decay_rate) * iv_factor)
+
+def validate_calendar_structure(orders: Sequence[Dict[str, Any]]) -> bool:
+    """
+    Validate that orders represent a proper calendar spread structure
+    """
+    if len(orders) != 4:
         return False
     
-    # Check that we have one short and one long for each option type
-    call_sides = [o.get("side") for o in calls]
-    put_sides = [o.get("side") for o in puts]
+    # One pass setting a bit per (option type, side); four legs can only cover
+    # all four bits with one short and one long of each of calls and puts
+    mask = 0
+    for order in orders:
+        mask |= _LEG_BITS.get((order.get("option_type"), order.get("side")), 0)
     
-    return ("BUY" in call_sides and "SELL" in call_sides and 
-            "BUY" in put_sides and "SELL" in put_sides)
+    return mask == _ALL_LEG_BITS
 
 # Export the strategy class and utilities
 __all__ = [
     "CalendarSpreadStrategy",
-    "calculate_time_decay_advantage", 
+    "CalendarLegs",
+    "CalendarSignal",
+    "CalendarRiskConfig",
+    "RiskLevels",
+    "calculate_time_decay_advantage",
+    "calculate_time_decay_advantage_batch",
+    "calculate_theta_advantage_batch",
     "validate_calendar_structure"
 ]
@@ -7,13 +7,138 @@ Directional Futures Strategy – F&O (NIFTY/BANKNIFTY only) | 2-leg hedged struc
 """
 
 from datetime import datetime
-from typing import Dict, List, Any
-from app.strategies.base import BaseStrategy
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+import sys
+import numpy as np
+from app.strategies.base import BaseStrategy, NO_ACTION
 from app.config import StrategyType, get_instrument_config, validate_instrument_liquidity
 import logging
 
 logger = logging.getLogger("DirectionalFuturesStrategy")
 
+# Interned leg field values shared by every generated order
+BUY = sys.intern("BUY")
+SELL = sys.intern("SELL")
+CE = sys.intern("CE")
+PE = sys.intern("PE")
+FUTURES = sys.intern("FUTURES")
+
+# Instrument liquidity/config are fixed for the process lifetime; call
+# cache_clear() on these if settings are ever reloaded at runtime
+_liquid = lru_cache(maxsize=8)(validate_instrument_liquidity)
+
+@lru_cache(maxsize=8)
+def _lot_qty(symbol: str, default: int = 50) -> int:
+    """Lot size per instrument, falling back to default when the config has none"""
+    return get_instrument_config(symbol).get("lot_size", default)
+
+# Leg count from which calculate_position_delta switches to NumPy
+_VECTORIZE_MIN_LEGS = 16
+
+# SPAN margin is approximately 10-15% of futures contract value
+_SPAN_MARGIN_RATE = 0.12
+
+# Directional biases that qualify for entry
+_CLEAR_BIASES = frozenset(("BULLISH", "BEARISH"))
+
+# Option types that mark a hedge leg in validate_directional_futures_structure
+_OPTION_TYPES = frozenset((CE, PE))
+
+# What differs between LONG and SHORT: (hedge option type, hedge leg type, futures side)
+_DIRECTION_LEGS = {
+    "LONG": (PE, "hedge_put", BUY),
+    "SHORT": (CE, "hedge_call", SELL)
+}
+
+# Direction as a signed int for numeric fast paths; orders keep the "LONG"/"SHORT" strings
+_LONG = 1
+_SHORT = -1
+_DIRECTION_SIGN = {"LONG": _LONG, "SHORT": _SHORT}
+
+# (hedge strike step, side of spot) per (symbol, direction); the distance is an instance setting
+_HEDGE_STEP_SIGN = MappingProxyType({
+    ("NIFTY", "LONG"): (50, -1),
+    ("NIFTY", "SHORT"): (50, 1),
+    ("BANKNIFTY", "LONG"): (100, -1),
+    ("BANKNIFTY", "SHORT"): (100, 1)
+})
+
+# Static fields of each leg per direction; generate_orders adds symbol, size and expiry
+_HEDGE_TEMPLATES = {
+    direction: MappingProxyType({
+        "side": BUY,
+        "leg_type": hedge_leg,
+        "is_hedge": True,
+        "option_type": option_type,
+        "priority": 1,  # Execute FIRST
+        "execution_order": "HEDGE_FIRST"
+    })
+    for direction, (option_type, hedge_leg, _) in _DIRECTION_LEGS.items()
+}
+_MAIN_TEMPLATES = {
+    direction: MappingProxyType({
+        "side": futures_side,
+        "leg_type": "main_futures",
+        "is_hedge": False,
+        "instrument_type": FUTURES,
+        "priority": 2,  # Execute AFTER hedge
+        "execution_order": "MAIN_AFTER_HEDGE"
+    })
+    for direction, (_, _, futures_side) in _DIRECTION_LEGS.items()
+}
+
+# Descriptive part of get_strategy_specific_metrics; does not depend on parameters
+_PROFILE_METRICS = MappingProxyType({
+    "risk_profile": "HIGH (directional exposure with hedge protection)",
+    "profit_profile": "HIGH potential in trending markets",
+    "market_outlook": "DIRECTIONAL (bullish or bearish)",
+    "delta_strategy": "HIGH (significant directional exposure)",
+    "theta_impact": "MINIMAL (futures have no time decay)",
+    "gamma_risk": "LOW (futures have no gamma)",
+    "vega_sensitivity": "LOW (minimal options exposure)",
+    "trend_dependent": True,
+    "volume_dependent": True,
+    "best_conditions": "Strong trending markets with clear directional bias",
+    "hedge_first_execution": True,
+    "margin_efficiency": "HIGH (futures with hedge)"
+})
+
+# Hedge validation wording per direction: (option, side of spot, position)
+_HEDGE_LABELS = {
+    "LONG": ("Put", "below", "long"),
+    "SHORT": ("Call", "above", "short")
+}
+
+# on_mtm_tick decision codes, in precedence order, and their (action, urgency)
+_MTM_NONE = 0
+_MTM_HARD_STOP = 1
+_MTM_TAKE_PROFIT = 2
+_MTM_TREND_REVERSAL = 3
+_MTM_EXPIRY_RISK = 4
+_MTM_MOMENTUM_PROFIT = 5
+_MTM_SOFT_WARN = 6
+_MTM_ACTIONS = (
+    (None, None),
+    ("HARD_STOP", "HIGH"),
+    ("TAKE_PROFIT", "MEDIUM"),
+    ("TREND_REVERSAL_WARNING", "MEDIUM"),
+    ("EXPIRY_RISK_WARNING", "MEDIUM"),
+    ("MOMENTUM_PROFIT_OPPORTUNITY", "LOW"),
+    ("SOFT_WARN", "MEDIUM")
+)
+
+# Fixed trailing fields of check_trend_conditions alerts; the message carries live values
+_REVERSAL_ALERT_FIELDS = MappingProxyType({
+    "recommended_action": "Consider exit",
+    "urgency": "HIGH"
+})
+_WEAKENING_WARNING_FIELDS = MappingProxyType({
+    "recommended_action": "Monitor closely",
+    "urgency": "MEDIUM"
+})
+
 class DirectionalFuturesStrategy(BaseStrategy):
     """
     Directional Futures Strategy - 2-leg hedged structure:
@@ -53,30 +178,29 @@ class DirectionalFuturesStrategy(BaseStrategy):
         - Clear directional bias identified
         - No major events or expiry day
         """
+        # Cheapest and most-rejecting checks first; liquidity lookup last
         symbol = market_data.get("symbol")
-        vix = market_data.get("vix", 0)
-        trend_strength = abs(market_data.get("trend_strength", 0))
-        directional_bias = market_data.get("directional_bias", "NEUTRAL")
-        events = market_data.get("upcoming_events", [])
-        expiry = market_data.get("is_expiry", False)
-        volume_surge = market_data.get("volume_surge", False)
-        days_to_expiry = market_data.get("days_to_expiry", 0)
+        if symbol not in self._allowed_set:
+            return False
+        if market_data.get("is_expiry", False) or market_data.get("upcoming_events"):
+            return False
+        if not self.min_days_to_expiry <= market_data.get("days_to_expiry", 0) <= self.max_days_to_expiry:
+            return False
+        if market_data.get("directional_bias", "NEUTRAL") not in _CLEAR_BIASES:  # Clear direction required
+            return False
+        if not self.min_vix <= market_data.get("vix", 0) <= self.max_vix:
+            return False
+        if not abs(market_data.get("trend_strength", 0)) >= self.min_trend_strength:
+            return False
+        if not market_data.get("volume_surge", False):  # Prefer high volume trending days
+            return False
         
         # Strict liquidity validation
-        if not validate_instrument_liquidity(symbol):
-            logger.warning(f"Directional Futures rejected: {symbol} not in liquid instruments")
+        if not _liquid(symbol):
+            logger.warning("Directional Futures rejected: %s not in liquid instruments", symbol)
             return False
         
-        return (
-            symbol in self.allowed_instruments and
-            self.min_vix <= vix <= self.max_vix and
-            trend_strength >= self.min_trend_strength and
-            directional_bias in ["BULLISH", "BEARISH"] and  # Clear direction required
-            not expiry and
-            not events and
-            self.min_days_to_expiry <= days_to_expiry <= self.max_days_to_expiry and
-            volume_surge  # Prefer high volume trending days
-        )
+        return True
 
     def generate_orders(self, signal: Dict, config: Dict, lot_size: int) -> List[Dict[str, Any]]:
         """
@@ -98,89 +222,48 @@ class DirectionalFuturesStrategy(BaseStrategy):
         lots = config.get("lot_count", 1)
         
         # Validate direction and hedge
-        if direction not in ["LONG", "SHORT"]:
+        if direction not in _DIRECTION_LEGS:
             raise ValueError(f"Invalid direction for Directional Futures: {direction}")
         
         if not self._validate_futures_hedge(symbol, spot_price, hedge_strike, direction):
             raise ValueError(f"Invalid hedge configuration for {symbol} {direction} futures")
         
-        # Get instrument configuration
-        instrument_config = get_instrument_config(symbol)
-        lot_qty = instrument_config.get("lot_size", 50)
+        lot_qty = _lot_qty(symbol)
         
-        # Futures symbol construction
+        # Contract symbols, built once and reused by the orders and the log line
+        hedge_template = _HEDGE_TEMPLATES[direction]
+        option_type = hedge_template["option_type"]
+        strike_label = f"{int(hedge_strike)}{option_type}"
+        hedge_symbol = f"{symbol}{expiry}{strike_label}"
         futures_symbol = f"{symbol}{expiry}FUT"
         
         # HEDGE-FIRST ORDER EXECUTION (for margin benefit)
-        if direction == "LONG":
-            # Long Futures + Put Hedge (downside protection)
-            orders = [
-                # 1. BUY Far OTM Put HEDGE (FIRST - for margin benefit)
-                {
-                    "symbol": f"{symbol}{expiry}{int(hedge_strike)}PE",
-                    "side": "BUY",
-                    "lots": lots,
-                    "quantity": lots * lot_qty,
-                    "leg_type": "hedge_put",
-                    "is_hedge": True,
-                    "strike": hedge_strike,
-                    "option_type": "PE",
-                    "expiry": expiry,
-                    "priority": 1,  # Execute FIRST
-                    "execution_order": "HEDGE_FIRST"
-                },
-                
-                # 2. BUY Futures (SECOND - after hedge is in place)
-                {
-                    "symbol": futures_symbol,
-                    "side": "BUY",
-                    "lots": lots,
-                    "quantity": lots * lot_qty,
-                    "leg_type": "main_futures",
-                    "is_hedge": False,
-                    "instrument_type": "FUTURES",
-                    "expiry": expiry,
-                    "priority": 2,  # Execute AFTER hedge
-                    "execution_order": "MAIN_AFTER_HEDGE"
-                }
-            ]
-        else:  # SHORT
-            # Short Futures + Call Hedge (upside protection)
-            orders = [
-                # 1. BUY Far OTM Call HEDGE (FIRST - for margin benefit)
-                {
-                    "symbol": f"{symbol}{expiry}{int(hedge_strike)}CE",
-                    "side": "BUY",
-                    "lots": lots,
-                    "quantity": lots * lot_qty,
-                    "leg_type": "hedge_call",
-                    "is_hedge": True,
-                    "strike": hedge_strike,
-                    "option_type": "CE",
-                    "expiry": expiry,
-                    "priority": 1,  # Execute FIRST
-                    "execution_order": "HEDGE_FIRST"
-                },
-                
-                # 2. SELL Futures (SECOND - after hedge is in place)
-                {
-                    "symbol": futures_symbol,
-                    "side": "SELL",
-                    "lots": lots,
-                    "quantity": lots * lot_qty,
-                    "leg_type": "main_futures",
-                    "is_hedge": False,
-                    "instrument_type": "FUTURES",
-                    "expiry": expiry,
-                    "priority": 2,  # Execute AFTER hedge
-                    "execution_order": "MAIN_AFTER_HEDGE"
-                }
-            ]
-        
-        logger.info(f"Generated Directional Futures {direction} for {symbol}: "
-                   f"Futures: {futures_symbol}, "
-                   f"Hedge: {hedge_strike}{'PE' if direction == 'LONG' else 'CE'}, "
-                   f"HEDGE-FIRST execution for margin benefit")
+        # LONG: Long Futures + Put Hedge (downside protection)
+        # SHORT: Short Futures + Call Hedge (upside protection)
+        quantity = lots * lot_qty
+        orders = [
+            # 1. BUY Far OTM option HEDGE (FIRST - for margin benefit)
+            {
+                **hedge_template,
+                "symbol": hedge_symbol,
+                "lots": lots,
+                "quantity": quantity,
+                "strike": hedge_strike,
+                "expiry": expiry
+            },
+            # 2. BUY/SELL Futures (SECOND - after hedge is in place)
+            {
+                **_MAIN_TEMPLATES[direction],
+                "symbol": futures_symbol,
+                "lots": lots,
+                "quantity": quantity,
+                "expiry": expiry
+            }
+        ]
+        
+        logger.info("Generated Directional Futures %s for %s: Futures: %s, Hedge: %s%s, "
+                    "HEDGE-FIRST execution for margin benefit",
+                    direction, symbol, futures_symbol, hedge_strike, option_type)
         
         return orders
 
@@ -191,89 +274,63 @@ class DirectionalFuturesStrategy(BaseStrategy):
         - Trend reversal detection for early exit
         - Momentum-based profit taking
         """
-        base_sl = config.get("sl_per_lot", 3000) * lot_count  # Higher SL for futures
-        base_tp = config.get("tp_per_lot", 6000) * lot_count  # Higher TP potential
-        
-        direction = config.get("direction", "LONG")
         trend_strength = config.get("current_trend_strength", 0)
         entry_trend_strength = config.get("entry_trend_strength", 0)
         days_to_expiry = config.get("days_to_expiry", 10)
         
-        # Adjust SL/TP based on trend strength
+        # Higher SL/TP for futures; per-position levels are cached, the live trend is not
+        levels = _mtm_thresholds(config.get("sl_per_lot", 3000), config.get("tp_per_lot", 6000),
+                                 lot_count, entry_trend_strength)
+        
+        # Adjust TP based on trend strength
         trend_multiplier = min(1.5, max(0.8, trend_strength / 2.0))
-        adjusted_tp = base_tp * trend_multiplier
+        take_profit = levels.base_tp * trend_multiplier
         
         # Trend reversal detection
-        trend_weakening = trend_strength < entry_trend_strength * 0.6
+        trend_weakening = trend_strength < levels.reversal_level
         
-        if mtm <= -base_sl:
-            return {
-                "action": "HARD_STOP",
-                "reason": f"Directional Futures {direction} SL triggered",
-                "urgency": "HIGH"
-            }
-        elif mtm >= adjusted_tp:
-            return {
-                "action": "TAKE_PROFIT",
-                "reason": f"Directional Futures {direction} TP achieved (trend-adjusted)",
-                "urgency": "MEDIUM"
-            }
-        elif trend_weakening:
-            return {
-                "action": "TREND_REVERSAL_WARNING",
-                "reason": f"Trend weakening: {entry_trend_strength:.1f} → {trend_strength:.1f}",
-                "urgency": "MEDIUM"
-            }
-        elif days_to_expiry <= 5:
-            return {
-                "action": "EXPIRY_RISK_WARNING",
-                "reason": f"Futures expiry in {days_to_expiry} days",
-                "urgency": "MEDIUM"
-            }
-        elif mtm >= adjusted_tp * 0.7:
-            return {
-                "action": "MOMENTUM_PROFIT_OPPORTUNITY",
-                "reason": f"Strong momentum: 70% of target achieved",
-                "urgency": "LOW"
-            }
-        elif mtm <= -base_sl * 0.8:
-            return {
-                "action": "SOFT_WARN",
-                "reason": f"Approaching Directional Futures SL ({direction})",
-                "urgency": "MEDIUM"
-            }
+        code = _mtm_code(mtm, levels, take_profit, trend_weakening, days_to_expiry)
+        if code == _MTM_NONE:
+            return NO_ACTION
+        
+        # Only ticks that trigger something need the direction
+        direction = config.get("direction", "LONG")
         
-        return {"action": None}
+        # Direction-only responses are shared; trend/expiry warnings carry live values
+        response = _MTM_RESPONSES.get((code, direction))
+        if response is not None:
+            return response
+        return _mtm_response(code, direction, entry_trend_strength, trend_strength, days_to_expiry)
+
+    def _hedge_geometry(self, symbol: str, direction: str) -> Tuple[float, int, int]:
+        """(base hedge distance, strike step, side of spot) for a symbol/direction"""
+        distance = self.hedge_distance_banknifty if symbol == "BANKNIFTY" else self.hedge_distance_nifty
+        params = _HEDGE_STEP_SIGN.get((symbol, direction))
+        if params is None:
+            # Other symbols: 100-point strikes; anything but LONG hedges like SHORT
+            step, _ = _HEDGE_STEP_SIGN.get((symbol, "LONG"), (100, -1))
+            return distance, step, -1 if _DIRECTION_SIGN.get(direction) == _LONG else 1
+        return (distance, *params)
 
     def _validate_futures_hedge(self, symbol: str, spot_price: float,
                                hedge_strike: float, direction: str) -> bool:
         """Validate futures hedge configuration"""
+        if direction not in _DIRECTION_SIGN:
+            return True
         
-        if direction == "LONG":
-            # Long futures needs put hedge below spot
-            if hedge_strike >= spot_price:
-                logger.error(f"Put hedge {hedge_strike} not below spot {spot_price} for long futures")
-                return False
-            
-            # Check hedge distance
-            hedge_distance = spot_price - hedge_strike
-            expected_distance = self.hedge_distance_banknifty if symbol == "BANKNIFTY" else self.hedge_distance_nifty
-            
-            if hedge_distance < expected_distance * 0.5:
-                logger.warning(f"Put hedge distance {hedge_distance} too small for {symbol}")
-        
-        elif direction == "SHORT":
-            # Short futures needs call hedge above spot
-            if hedge_strike <= spot_price:
-                logger.error(f"Call hedge {hedge_strike} not above spot {spot_price} for short futures")
-                return False
-            
-            # Check hedge distance
-            hedge_distance = hedge_strike - spot_price
-            expected_distance = self.hedge_distance_banknifty if symbol == "BANKNIFTY" else self.hedge_distance_nifty
-            
-            if hedge_distance < expected_distance * 0.5:
-                logger.warning(f"Call hedge distance {hedge_distance} too small for {symbol}")
+        # Long futures needs a put hedge below spot, short futures a call hedge above;
+        # the check itself is numeric, the wording is only looked up when logging
+        expected_distance, _, sign = self._hedge_geometry(symbol, direction)
+        hedge_distance = sign * (hedge_strike - spot_price)
+        
+        if hedge_distance <= 0:
+            option, side, position = _HEDGE_LABELS[direction]
+            logger.error("%s hedge %s not %s spot %s for %s futures", option, hedge_strike, side, spot_price, position)
+            return False
+        
+        # Check hedge distance
+        if hedge_distance < expected_distance * 0.5:
+            logger.warning("%s hedge distance %s too small for %s", _HEDGE_LABELS[direction][0], hedge_distance, symbol)
         
         return True
 
@@ -282,26 +339,13 @@ class DirectionalFuturesStrategy(BaseStrategy):
         """
         Calculate optimal hedge strike based on direction and volatility
         """
-        base_distance = self.hedge_distance_banknifty if symbol == "BANKNIFTY" else self.hedge_distance_nifty
+        base_distance, step, sign = self._hedge_geometry(symbol, direction)
         
         # Adjust hedge distance based on VIX (higher VIX = further OTM hedge)
         vix_multiplier = min(1.5, max(0.8, current_vix / 25.0))
-        adjusted_distance = base_distance * vix_multiplier
-        
-        if direction == "LONG":
-            # Put hedge below spot
-            if symbol == "NIFTY":
-                hedge_strike = round((spot_price - adjusted_distance) / 50) * 50
-            else:  # BANKNIFTY
-                hedge_strike = round((spot_price - adjusted_distance) / 100) * 100
-        else:  # SHORT
-            # Call hedge above spot
-            if symbol == "NIFTY":
-                hedge_strike = round((spot_price + adjusted_distance) / 50) * 50
-            else:  # BANKNIFTY
-                hedge_strike = round((spot_price + adjusted_distance) / 100) * 100
-        
-        return hedge_strike
+        
+        # Put hedge below spot (LONG) or call hedge above spot (SHORT)
+        return round((spot_price + sign * base_distance * vix_multiplier) / step) * step
 
     def check_trend_conditions(self, current_data: Dict, entry_data: Dict) -> Dict[str, Any]:
         """
@@ -309,67 +353,71 @@ class DirectionalFuturesStrategy(BaseStrategy):
         """
         entry_trend_strength = entry_data.get("trend_strength", 0)
         current_trend_strength = current_data.get("trend_strength", 0)
-        entry_direction = entry_data.get("direction", "LONG")
+        entry_sign = _DIRECTION_SIGN.get(entry_data.get("direction", "LONG"), 0)
         
-        # Check for trend reversal
-        if entry_direction == "LONG" and current_trend_strength < -1.0:
+        # Reversal: trend beyond 1.0 against the entry direction (never for unknown directions)
+        if entry_sign * current_trend_strength < -1.0:
+            trend = "Bullish" if entry_sign == _LONG else "Bearish"
             return {
                 "action": "TREND_REVERSAL_ALERT",
-                "message": f"Bullish trend reversed: {entry_trend_strength:.1f} → {current_trend_strength:.1f}",
-                "recommended_action": "Consider exit",
-                "urgency": "HIGH"
-            }
-        elif entry_direction == "SHORT" and current_trend_strength > 1.0:
-            return {
-                "action": "TREND_REVERSAL_ALERT", 
-                "message": f"Bearish trend reversed: {entry_trend_strength:.1f} → {current_trend_strength:.1f}",
-                "recommended_action": "Consider exit",
-                "urgency": "HIGH"
+                "message": f"{trend} trend reversed: {entry_trend_strength:.1f} → {current_trend_strength:.1f}",
+                **_REVERSAL_ALERT_FIELDS
             }
         
         # Check for trend weakening
         trend_change_pct = abs(current_trend_strength - entry_trend_strength) / abs(entry_trend_strength) * 100 if entry_trend_strength != 0 else 0
-        
         if trend_change_pct > 50:  # 50% trend strength change
             return {
                 "action": "TREND_WEAKENING_WARNING",
                 "message": f"Trend strength changed {trend_change_pct:.1f}%",
-                "recommended_action": "Monitor closely",
-                "urgency": "MEDIUM"
+                **_WEAKENING_WARNING_FIELDS
             }
         
-        return {"action": None}
+        return NO_ACTION
 
     def calculate_position_delta(self, orders: List[Dict[str, Any]], 
-                               spot_price: float) -> float:
+                               spot_price: float, volatility: Optional[float] = None,
+                               time_to_expiry: Optional[float] = None,
+                               risk_free_rate: float = 0.0) -> float:
         """
         Calculate net position delta (sensitivity to underlying price)
+        
+        With volatility (annualised, e.g. 0.15) and time_to_expiry (years), option
+        legs use Black-Scholes delta, puts negative; otherwise the simplified
+        moneyness estimate is used.
         """
+        if volatility is not None and time_to_expiry is not None:
+            if volatility <= 0 or time_to_expiry <= 0:
+                raise ValueError("volatility and time_to_expiry must be positive")
+            return _position_delta_vectorized(orders, spot_price,
+                                              (volatility, time_to_expiry, risk_free_rate))
+        
+        # Baskets go through one NumPy pass; a hedged pair is cheaper in plain Python
+        if len(orders) >= _VECTORIZE_MIN_LEGS:
+            return _position_delta_vectorized(orders, spot_price)
+        
         # Futures delta is approximately ±1.0 per lot
         # Options delta depends on strike and time to expiry
         net_delta = 0.0
         
         for order in orders:
-            if order.get("instrument_type") == "FUTURES":
-                if order.get("side") == "BUY":
-                    net_delta += order.get("lots", 1) * 1.0  # Long futures delta ≈ +1
-                else:
-                    net_delta -= order.get("lots", 1) * 1.0  # Short futures delta ≈ -1
+            if order.get("instrument_type") == FUTURES:
+                leg_delta = 1.0  # Long futures delta ≈ +1, short ≈ -1
             else:
                 # Option delta (simplified calculation)
                 strike = order.get("strike", spot_price)
-                option_type = order.get("option_type", "CE")
                 
                 # Simplified delta calculation (would use Black-Scholes in production)
-                if option_type == "CE":
-                    option_delta = max(0.05, min(0.95, (spot_price - strike) / spot_price + 0.5))
+                if order.get("option_type", CE) == CE:
+                    leg_delta = max(0.05, min(0.95, (spot_price - strike) / spot_price + 0.5))
                 else:  # PE
-                    option_delta = max(0.05, min(0.95, (strike - spot_price) / spot_price + 0.5))
-                
-                if order.get("side") == "BUY":
-                    net_delta += order.get("lots", 1) * option_delta
-                else:
-                    net_delta -= order.get("lots", 1) * option_delta
+                    leg_delta = max(0.05, min(0.95, (strike - spot_price) / spot_price + 0.5))
+            
+            # Side decides the sign once for either instrument
+            if order.get("side") == BUY:
+                net_delta += order.get("lots", 1) * leg_delta
+            else:
+                net_delta -= order.get("lots", 1) * leg_delta
         
         return net_delta
 
@@ -391,6 +439,8 @@ class DirectionalFuturesStrategy(BaseStrategy):
         """Get Directional Futures specific performance metrics"""
         base_metrics = self.get_strategy_info()
         
+        # Tunable parameters are read per call (nested dicts stay private to the
+        # caller); the descriptive profile is shared from _PROFILE_METRICS
         directional_futures_metrics = {
             "hedge_distances": {
                 "NIFTY": self.hedge_distance_nifty,
@@ -399,62 +449,154 @@ class DirectionalFuturesStrategy(BaseStrategy):
             "min_trend_strength": self.min_trend_strength,
             "vix_range": {"min": self.min_vix, "max": self.max_vix},
             "dte_range": {"min": self.min_days_to_expiry, "max": self.max_days_to_expiry},
-            "risk_profile": "HIGH (directional exposure with hedge protection)",
-            "profit_profile": "HIGH potential in trending markets",
-            "market_outlook": "DIRECTIONAL (bullish or bearish)",
-            "delta_strategy": "HIGH (significant directional exposure)",
-            "theta_impact": "MINIMAL (futures have no time decay)",
-            "gamma_risk": "LOW (futures have no gamma)",
-            "vega_sensitivity": "LOW (minimal options exposure)",
-            "trend_dependent": True,
-            "volume_dependent": True,
-            "best_conditions": "Strong trending markets with clear directional bias",
-            "hedge_first_execution": True,
-            "margin_efficiency": "HIGH (futures with hedge)"
+            **_PROFILE_METRICS
         }
         
         return {**base_metrics, **directional_futures_metrics}
 
+class _MtmThresholds(NamedTuple):
+    """on_mtm_tick thresholds that depend only on the position, not the live trend"""
+    hard_stop: float        # HARD_STOP at mtm <= hard_stop
+    base_tp: float          # TAKE_PROFIT before the trend-strength multiplier
+    soft_stop: float        # SOFT_WARN at mtm <= soft_stop
+    reversal_level: float   # Trend weakening below 60% of entry trend strength
+
+@lru_cache(maxsize=256)
+def _mtm_thresholds(sl_per_lot: float, tp_per_lot: float, lot_count: int,
+                    entry_trend_strength: float) -> _MtmThresholds:
+    """Per-position thresholds; they change only when the config does, not per tick"""
+    base_sl = sl_per_lot * lot_count
+    return _MtmThresholds(
+        hard_stop=-base_sl,
+        base_tp=tp_per_lot * lot_count,
+        soft_stop=-base_sl * 0.8,
+        reversal_level=entry_trend_strength * 0.6
+    )
+
+def _mtm_code(mtm: float, levels: _MtmThresholds, take_profit: float,
+              trend_weakening: bool, days_to_expiry: float) -> int:
+    """Decision core of on_mtm_tick: comparisons only, _MTM_* code out"""
+    if mtm <= levels.hard_stop:
+        return _MTM_HARD_STOP
+    if mtm >= take_profit:
+        return _MTM_TAKE_PROFIT
+    if trend_weakening:
+        return _MTM_TREND_REVERSAL
+    if days_to_expiry <= 5:
+        return _MTM_EXPIRY_RISK
+    if mtm >= take_profit * 0.7:
+        return _MTM_MOMENTUM_PROFIT
+    if mtm <= levels.soft_stop:
+        return _MTM_SOFT_WARN
+    return _MTM_NONE
+
+def _mtm_response(code: int, direction: str, entry_trend_strength: float = 0.0,
+                  trend_strength: float = 0.0, days_to_expiry: float = 0) -> Dict[str, Any]:
+    """on_mtm_tick result for a non-zero _MTM_* code"""
+    if code == _MTM_HARD_STOP:
+        reason = f"Directional Futures {direction} SL triggered"
+    elif code == _MTM_TAKE_PROFIT:
+        reason = f"Directional Futures {direction} TP achieved (trend-adjusted)"
+    elif code == _MTM_TREND_REVERSAL:
+        reason = f"Trend weakening: {entry_trend_strength:.1f} → {trend_strength:.1f}"
+    elif code == _MTM_EXPIRY_RISK:
+        reason = f"Futures expiry in {days_to_expiry} days"
+    elif code == _MTM_MOMENTUM_PROFIT:
+        reason = "Strong momentum: 70% of target achieved"
+    else:
+        reason = f"Approaching Directional Futures SL ({direction})"
+    
+    action, urgency = _MTM_ACTIONS[code]
+    return {"action": action, "reason": reason, "urgency": urgency}
+
+# Shared read-only on_mtm_tick results whose reason depends on direction only
+_MTM_RESPONSES = {
+    (code, direction): MappingProxyType(_mtm_response(code, direction))
+    for code in (_MTM_HARD_STOP, _MTM_TAKE_PROFIT, _MTM_MOMENTUM_PROFIT, _MTM_SOFT_WARN)
+    for direction in _DIRECTION_LEGS
+}
+
+def _norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal CDF via the Abramowitz & Stegun 7.1.26 erf approximation (|error| < 1.5e-7)"""
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.copysign(erf, x))
+
+def _position_delta_vectorized(orders: List[Dict[str, Any]], spot_price: float,
+                               black_scholes: Optional[Tuple[float, float, float]] = None) -> float:
+    """
+    calculate_position_delta for many legs as one NumPy expression
+    black_scholes is (volatility, time_to_expiry, risk_free_rate) for Black-Scholes option deltas
+    """
+    lots = np.fromiter((o.get("lots", 1) for o in orders), dtype=np.float64, count=len(orders))
+    strikes = np.fromiter((o.get("strike", spot_price) for o in orders), dtype=np.float64, count=len(orders))
+    sign = np.where([o.get("side") == BUY for o in orders], 1.0, -1.0)
+    is_futures = np.array([o.get("instrument_type") == FUTURES for o in orders], dtype=bool)
+    is_call = np.array([o.get("option_type", CE) == CE for o in orders], dtype=bool)
+    
+    if black_scholes is None:
+        # Simplified option delta; futures ≈ ±1
+        moneyness = np.where(is_call, spot_price - strikes, strikes - spot_price) / spot_price
+        option_delta = np.clip(moneyness + 0.5, 0.05, 0.95)
+    else:
+        volatility, time_to_expiry, rate = black_scholes
+        vol_sqrt_t = volatility * np.sqrt(time_to_expiry)
+        d1 = (np.log(spot_price / strikes) + (rate + 0.5 * volatility ** 2) * time_to_expiry) / vol_sqrt_t
+        call_delta = _norm_cdf(d1)
+        option_delta = np.where(is_call, call_delta, call_delta - 1.0)
+    delta = np.where(is_futures, 1.0, option_delta)
+    
+    return float(np.sum(sign * lots * delta))
+
 # Utility functions for Directional Futures analysis
 def validate_directional_futures_structure(orders: List[Dict[str, Any]]) -> bool:
     """Validate that orders represent proper Directional Futures structure"""
     if len(orders) != 2:
         return False
     
-    # Should have one futures and one options hedge
-    futures_orders = [o for o in orders if o.get("instrument_type") == "FUTURES"]
-    option_orders = [o for o in orders if o.get("option_type") in ["CE", "PE"]]
+    # Should have one futures and one options hedge, counted in a single pass
+    futures_count = option_count = 0
+    hedge_order = None
+    for o in orders:
+        if o.get("instrument_type") == FUTURES:
+            futures_count += 1
+        if o.get("option_type") in _OPTION_TYPES:
+            option_count += 1
+            hedge_order = o
     
-    if len(futures_orders) != 1 or len(option_orders) != 1:
+    if futures_count != 1 or option_count != 1:
         return False
     
     # Hedge order should be a buy
-    hedge_order = option_orders[0]
-    return hedge_order.get("side") == "BUY" and hedge_order.get("is_hedge") == True
+    return hedge_order.get("side") == BUY and hedge_order.get("is_hedge") == True
 
 def calculate_futures_margin_requirement(symbol: str, lots: int, spot_price: float) -> float:
     """
     Calculate approximate futures margin requirement
     """
-    # SPAN margin is approximately 10-15% of contract value
-    lot_size = 50 if symbol == "NIFTY" else 15  # BANKNIFTY
-    contract_value = spot_price * lot_size * lots
-    span_margin_rate = 0.12  # 12% approximate
-    
-    return contract_value * span_margin_rate
+    # Same cached lot size generate_orders uses; unknown symbols keep the BANKNIFTY lot
+    lot_size = _lot_qty(symbol, 15)
+    return spot_price * lot_size * lots * _SPAN_MARGIN_RATE
 
 def check_hedge_first_execution_futures(orders: List[Dict[str, Any]]) -> bool:
     """Verify that hedge option is executed before futures position"""
-    futures_orders = [o for o in orders if o.get("instrument_type") == "FUTURES"]
-    hedge_orders = [o for o in orders if o.get("is_hedge", False)]
+    # Priority of the first futures leg and the first hedge leg, in one pass
+    hedge_priority = futures_priority = None
+    have_hedge = have_futures = False
+    for o in orders:
+        if not have_futures and o.get("instrument_type") == FUTURES:
+            futures_priority = o.get("priority", 999)
+            have_futures = True
+        if not have_hedge and o.get("is_hedge", False):
+            hedge_priority = o.get("priority", 999)
+            have_hedge = True
     
-    if not futures_orders or not hedge_orders:
+    if not (have_futures and have_hedge):
         return False
     
-    # Check priority - hedge should have lower priority number (execute first)
-    hedge_priority = hedge_orders[0].get("priority", 999)
-    futures_priority = futures_orders[0].get("priority", 999)
-    
+    # Hedge should have lower priority number (execute first)
     return hedge_priority < futures_priority
 
 # Export the strategy class and utilities
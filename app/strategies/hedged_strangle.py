@@ -7,13 +7,78 @@ Hedged Strangle Strategy – F&O (NIFTY/BANKNIFTY only) | 4-leg hedged structure
 """
 
 from datetime import datetime
-from typing import Dict, List, Any
-from app.strategies.base import BaseStrategy
+from typing import Dict, List, Any, NamedTuple, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+import numpy as np
+from app.strategies.base import BaseStrategy, NO_ACTION, option_symbol
 from app.config import StrategyType, get_instrument_config, validate_instrument_liquidity
 import logging
 
 logger = logging.getLogger("HedgedStrangleStrategy")
 
+# Entry requires a non-trending market with rich premium; positions warn below _LOW_IV_RANK
+_MAX_TREND_STRENGTH = 2.0
+_MIN_ENTRY_IV_RANK = 60
+_LOW_IV_RANK = 30
+
+# Valid strike interval per instrument
+_STRIKE_STEP = MappingProxyType({"NIFTY": 50, "BANKNIFTY": 100})
+
+# Liquidity is fixed for the process lifetime; only these instruments ever pass
+_LIQUID = frozenset(s for s in ("NIFTY", "BANKNIFTY") if validate_instrument_liquidity(s))
+
+@lru_cache(maxsize=8)
+def _lot_qty(symbol: str) -> int:
+    """Lot size per instrument; instrument config is fixed for the process lifetime"""
+    return get_instrument_config(symbol).get("lot_size", 50)
+
+# Shared read-only on_mtm_tick results (VIX crush and gamma warnings carry live values)
+_HARD_STOP = MappingProxyType({
+    "action": "HARD_STOP",
+    "reason": "Hedged Strangle SL triggered",
+    "urgency": "HIGH"
+})
+_TAKE_PROFIT = MappingProxyType({
+    "action": "TAKE_PROFIT",
+    "reason": "Hedged Strangle TP achieved",
+    "urgency": "MEDIUM"
+})
+_PROFIT_OPPORTUNITY = MappingProxyType({
+    "action": "PROFIT_OPPORTUNITY",
+    "reason": "60% of target profit achieved",
+    "urgency": "LOW"
+})
+_SOFT_WARN = MappingProxyType({
+    "action": "SOFT_WARN",
+    "reason": "Approaching Hedged Strangle SL",
+    "urgency": "MEDIUM"
+})
+
+class _MtmThresholds(NamedTuple):
+    """on_mtm_tick thresholds for one set of SL/TP, lot count and entry VIX"""
+    hard_stop: float       # HARD_STOP at mtm <= hard_stop
+    take_profit: float     # TAKE_PROFIT at mtm >= take_profit
+    partial_profit: float  # PROFIT_OPPORTUNITY at 60% of take_profit
+    soft_stop: float       # SOFT_WARN at 80% of the stop
+    entry_vix: float
+    vix_crush: float       # VOLATILITY_CRUSH_EXIT below 70% of entry VIX
+
+@lru_cache(maxsize=256)
+def _mtm_thresholds(sl_per_lot: float, tp_per_lot: float, lot_count: int,
+                    entry_vix: float) -> _MtmThresholds:
+    """Thresholds change only when the position config does, not per tick"""
+    sl = sl_per_lot * lot_count
+    tp = tp_per_lot * lot_count
+    return _MtmThresholds(
+        hard_stop=-sl,
+        take_profit=tp,
+        partial_profit=tp * 0.6,
+        soft_stop=-0.8 * sl,
+        entry_vix=entry_vix,
+        vix_crush=entry_vix * 0.7
+    )
+
 class HedgedStrangleStrategy(BaseStrategy):
     """
     Hedged Short Strangle Strategy - 4-leg structure:
@@ -29,6 +94,27 @@ class HedgedStrangleStrategy(BaseStrategy):
     required_leg_count = 4
     allowed_instruments = ["NIFTY", "BANKNIFTY"]
     
+    # Static fields of each leg in execution order; generate_orders adds symbol, size,
+    # strike and expiry
+    _LEG_TEMPLATES = (
+        # 1. BUY Far OTM Call HEDGE (FIRST - for margin benefit)
+        ("ce_hedge", MappingProxyType({"side": "BUY", "leg_type": "hedge_call", "is_hedge": True,
+                                       "option_type": "CE", "priority": 1,
+                                       "execution_order": "HEDGE_FIRST"})),
+        # 2. BUY Far OTM Put HEDGE (SECOND - for margin benefit)
+        ("pe_hedge", MappingProxyType({"side": "BUY", "leg_type": "hedge_put", "is_hedge": True,
+                                       "option_type": "PE", "priority": 2,
+                                       "execution_order": "HEDGE_FIRST"})),
+        # 3. SELL OTM Call (THIRD - after hedges are in place)
+        ("ce_otm", MappingProxyType({"side": "SELL", "leg_type": "short_call", "is_hedge": False,
+                                     "option_type": "CE", "priority": 3,
+                                     "execution_order": "MAIN_AFTER_HEDGE"})),
+        # 4. SELL OTM Put (FOURTH - after hedges are in place)
+        ("pe_otm", MappingProxyType({"side": "SELL", "leg_type": "short_put", "is_hedge": False,
+                                     "option_type": "PE", "priority": 4,
+                                     "execution_order": "MAIN_AFTER_HEDGE"}))
+    )
+    
     def __init__(self):
         super().__init__()
         self.min_vix = 20.0  # High volatility required
@@ -52,28 +138,26 @@ class HedgedStrangleStrategy(BaseStrategy):
         - No major events or expiry day
         - Sufficient implied volatility for premium collection
         """
-        symbol = market_data.get("symbol")
-        vix = market_data.get("vix", 0)
-        index_chg = abs(market_data.get("index_chg_pct", 0))
-        events = market_data.get("upcoming_events", [])
-        expiry = market_data.get("is_expiry", False)
-        trend_strength = abs(market_data.get("trend_strength", 0))
-        iv_rank = market_data.get("iv_rank", 50)  # Implied volatility rank
+        get = market_data.get
+        symbol = get("symbol")
         
         # Strict liquidity validation
-        if not validate_instrument_liquidity(symbol):
+        if symbol not in _LIQUID:
             logger.warning(f"Hedged Strangle rejected: {symbol} not in liquid instruments")
             return False
         
-        return (
-            symbol in self.allowed_instruments and
-            self.min_vix <= vix <= self.max_vix and
-            index_chg < settings.get("DANGER_ZONE_RISK", 1.25) and
-            trend_strength < 2.0 and  # Not strongly trending
-            not expiry and
-            not events and
-            iv_rank > 60  # High IV rank for good premium
-        )
+        # Cheapest and most-rejecting checks first; abs() only for survivors
+        if symbol not in self._allowed_set:
+            return False
+        if get("is_expiry", False) or get("upcoming_events", []):
+            return False
+        if not self.min_vix <= get("vix", 0) <= self.max_vix:
+            return False
+        if not get("iv_rank", 50) > _MIN_ENTRY_IV_RANK:  # High IV rank for good premium
+            return False
+        if not abs(get("index_chg_pct", 0)) < settings.get("DANGER_ZONE_RISK", 1.25):
+            return False
+        return abs(get("trend_strength", 0)) < _MAX_TREND_STRENGTH  # Not strongly trending
 
     def generate_orders(self, signal: Dict, config: Dict, lot_size: int) -> List[Dict[str, Any]]:
         """
@@ -101,76 +185,26 @@ class HedgedStrangleStrategy(BaseStrategy):
         if not self._validate_strangle_strikes(symbol, spot_price, ce_otm, pe_otm, ce_hedge, pe_hedge):
             raise ValueError(f"Invalid Hedged Strangle strike selection for {symbol}")
         
-        # Get instrument configuration
-        instrument_config = get_instrument_config(symbol)
-        lot_qty = instrument_config.get("lot_size", 50)
+        lot_qty = _lot_qty(symbol)
         
-        # HEDGE-FIRST ORDER EXECUTION (for margin benefit)
+        # HEDGE-FIRST ORDER EXECUTION (for margin benefit): fill the leg templates
+        strikes = {"ce_hedge": ce_hedge, "pe_hedge": pe_hedge, "ce_otm": ce_otm, "pe_otm": pe_otm}
+        quantity = lots * lot_qty
         orders = [
-            # 1. BUY Far OTM Call HEDGE (FIRST - for margin benefit)
-            {
-                "symbol": f"{symbol}{expiry}{int(ce_hedge)}CE",
-                "side": "BUY",
-                "lots": lots,
-                "quantity": lots * lot_qty,
-                "leg_type": "hedge_call",
-                "is_hedge": True,
-                "strike": ce_hedge,
-                "option_type": "CE",
-                "expiry": expiry,
-                "priority": 1,  # Execute FIRST
-                "execution_order": "HEDGE_FIRST"
-            },
-            
-            # 2. BUY Far OTM Put HEDGE (SECOND - for margin benefit)
-            {
-                "symbol": f"{symbol}{expiry}{int(pe_hedge)}PE",
-                "side": "BUY",
-                "lots": lots,
-                "quantity": lots * lot_qty,
-                "leg_type": "hedge_put",
-                "is_hedge": True,
-                "strike": pe_hedge,
-                "option_type": "PE",
-                "expiry": expiry,
-                "priority": 2,  # Execute SECOND
-                "execution_order": "HEDGE_FIRST"
-            },
-            
-            # 3. SELL OTM Call (THIRD - after hedges are in place)
-            {
-                "symbol": f"{symbol}{expiry}{int(ce_otm)}CE",
-                "side": "SELL",
-                "lots": lots,
-                "quantity": lots * lot_qty,
-                "leg_type": "short_call",
-                "is_hedge": False,
-                "strike": ce_otm,
-                "option_type": "CE",
-                "expiry": expiry,
-                "priority": 3,  # Execute AFTER hedges
-                "execution_order": "MAIN_AFTER_HEDGE"
-            },
-            
-            # 4. SELL OTM Put (FOURTH - after hedges are in place)
             {
-                "symbol": f"{symbol}{expiry}{int(pe_otm)}PE",
-                "side": "SELL",
+                **fixed,
+                "symbol": option_symbol(symbol, expiry, int(strikes[strike_key]), fixed["option_type"]),
                 "lots": lots,
-                "quantity": lots * lot_qty,
-                "leg_type": "short_put",
-                "is_hedge": False,
-                "strike": pe_otm,
-                "option_type": "PE",
-                "expiry": expiry,
-                "priority": 4,  # Execute AFTER hedges
-                "execution_order": "MAIN_AFTER_HEDGE"
+                "quantity": quantity,
+                "strike": strikes[strike_key],
+                "expiry": expiry
             }
+            for strike_key, fixed in self._LEG_TEMPLATES
         ]
         
         # Calculate expected net credit
         estimated_credit = self._calculate_estimated_credit(
-            signal.get("estimated_premiums", {}), lots * lot_qty
+            signal.get("estimated_premiums", {}), quantity
         )
         
         logger.info(f"Generated Hedged Strangle for {symbol}: "
@@ -181,6 +215,33 @@ class HedgedStrangleStrategy(BaseStrategy):
         
         return orders
 
+    def generate_legs(self, signal: Dict, config: Dict,
+                      lot_size: int) -> Tuple[Tuple[str, ...], np.ndarray]:
+        """
+        generate_orders as (contract symbols, structured array), for vectorized risk code
+        Rows follow hedge-first execution order; columns are strike, lots, quantity,
+        priority, is_hedge, side_is_buy and option_is_call. Validation is the same.
+        """
+        symbol = signal["symbol"]
+        expiry = signal["expiry"]
+        strikes = (signal["ce_hedge_strike"], signal["pe_hedge_strike"],
+                   signal["ce_otm_strike"], signal["pe_otm_strike"])
+        lots = config.get("lot_count", 1)
+        
+        ce_hedge, pe_hedge, ce_otm, pe_otm = strikes
+        if not self._validate_strangle_strikes(symbol, signal["spot_price"], ce_otm, pe_otm, ce_hedge, pe_hedge):
+            raise ValueError(f"Invalid Hedged Strangle strike selection for {symbol}")
+        
+        legs = _LEG_ROWS.copy()
+        legs["strike"] = strikes
+        legs["lots"] = lots
+        legs["quantity"] = lots * _lot_qty(symbol)
+        symbols = tuple(
+            option_symbol(symbol, expiry, int(strike), fixed["option_type"])
+            for strike, (_, fixed) in zip(strikes, self._LEG_TEMPLATES)
+        )
+        return symbols, legs
+
     def on_mtm_tick(self, mtm: float, config: Dict, lot_count: int) -> Dict[str, Any]:
         """
         Hedged Strangle specific risk management:
@@ -188,31 +249,22 @@ class HedgedStrangleStrategy(BaseStrategy):
         - Early exit on volatility crush
         - Gamma risk monitoring near expiry
         """
-        sl = config.get("sl_per_lot", 2500) * lot_count  # Higher SL for vol strategies
-        tp = config.get("tp_per_lot", 5000) * lot_count  # Higher TP potential
+        # Higher SL/TP for vol strategies; cached per SL/TP, lot count and entry VIX
+        levels = _mtm_thresholds(config.get("sl_per_lot", 2500), config.get("tp_per_lot", 5000),
+                                 lot_count, config.get("entry_vix", 20))
         
         # Check for volatility changes
         current_vix = config.get("current_vix", 20)
-        entry_vix = config.get("entry_vix", 20)
-        vix_crush = current_vix < entry_vix * 0.7  # 30% VIX drop
         days_to_expiry = config.get("days_to_expiry", 10)
         
-        if mtm <= -sl:
-            return {
-                "action": "HARD_STOP",
-                "reason": "Hedged Strangle SL triggered",
-                "urgency": "HIGH"
-            }
-        elif mtm >= tp:
-            return {
-                "action": "TAKE_PROFIT",
-                "reason": "Hedged Strangle TP achieved",
-                "urgency": "MEDIUM"
-            }
-        elif vix_crush:
+        if mtm <= levels.hard_stop:
+            return _HARD_STOP
+        elif mtm >= levels.take_profit:
+            return _TAKE_PROFIT
+        elif current_vix < levels.vix_crush:  # 30% VIX drop
             return {
                 "action": "VOLATILITY_CRUSH_EXIT",
-                "reason": f"VIX crushed from {entry_vix:.1f} to {current_vix:.1f}",
+                "reason": f"VIX crushed from {levels.entry_vix:.1f} to {current_vix:.1f}",
                 "urgency": "HIGH"
             }
         elif days_to_expiry <= 3:
@@ -221,40 +273,30 @@ class HedgedStrangleStrategy(BaseStrategy):
                 "reason": f"High gamma risk: {days_to_expiry} days to expiry",
                 "urgency": "MEDIUM"
             }
-        elif mtm >= tp * 0.6:
-            return {
-                "action": "PROFIT_OPPORTUNITY",
-                "reason": "60% of target profit achieved",
-                "urgency": "LOW"
-            }
-        elif mtm <= -0.8 * sl:
-            return {
-                "action": "SOFT_WARN",
-                "reason": "Approaching Hedged Strangle SL",
-                "urgency": "MEDIUM"
-            }
+        elif mtm >= levels.partial_profit:
+            return _PROFIT_OPPORTUNITY
+        elif mtm <= levels.soft_stop:
+            return _SOFT_WARN
         
-        return {"action": None}
+        return NO_ACTION
 
     def _validate_strangle_strikes(self, symbol: str, spot_price: float,
                                  ce_otm: float, pe_otm: float, 
                                  ce_hedge: float, pe_hedge: float) -> bool:
         """Validate Hedged Strangle strike selection"""
         
-        # Call strikes should be above spot
-        if ce_otm <= spot_price or ce_hedge <= ce_otm:
+        status = _strike_status(spot_price, ce_otm, pe_otm, ce_hedge, pe_hedge)
+        if status == _BAD_CALL:
             logger.error(f"Invalid call strikes: spot={spot_price}, ce_otm={ce_otm}, ce_hedge={ce_hedge}")
             return False
-        
-        # Put strikes should be below spot
-        if pe_otm >= spot_price or pe_hedge >= pe_otm:
+        if status == _BAD_PUT:
             logger.error(f"Invalid put strikes: spot={spot_price}, pe_otm={pe_otm}, pe_hedge={pe_hedge}")
             return False
         
         # Check hedge distances
         call_hedge_distance = ce_hedge - ce_otm
         put_hedge_distance = pe_otm - pe_hedge
-        expected_distance = self.hedge_distance_banknifty if symbol == "BANKNIFTY" else self.hedge_distance_nifty
+        _, expected_distance = self._strike_distances(symbol)
         
         if call_hedge_distance < expected_distance * 0.5:
             logger.warning(f"Call hedge distance {call_hedge_distance} too small for {symbol}")
@@ -274,36 +316,27 @@ class HedgedStrangleStrategy(BaseStrategy):
         net_credit_per_share = (ce_sale_premium + pe_sale_premium) - (ce_hedge_premium + pe_hedge_premium)
         return net_credit_per_share * total_quantity
 
+    def _strike_distances(self, symbol: str) -> Tuple[float, float]:
+        """(OTM distance, hedge distance) for a symbol; other symbols use the NIFTY settings"""
+        if symbol == "BANKNIFTY":
+            return self.otm_distance_banknifty, self.hedge_distance_banknifty
+        return self.otm_distance_nifty, self.hedge_distance_nifty
+
     def get_optimal_strikes(self, spot_price: float, symbol: str, 
                           current_vix: float) -> Dict[str, float]:
         """
         Calculate optimal Hedged Strangle strikes based on volatility
         """
-        if symbol == "NIFTY":
-            otm_distance = self.otm_distance_nifty
-            hedge_distance = self.hedge_distance_nifty
-            # Round to 50-point intervals
-            ce_otm = round((spot_price + otm_distance) / 50) * 50
-            pe_otm = round((spot_price - otm_distance) / 50) * 50
-        elif symbol == "BANKNIFTY":
-            otm_distance = self.otm_distance_banknifty
-            hedge_distance = self.hedge_distance_banknifty
-            # Round to 100-point intervals
-            ce_otm = round((spot_price + otm_distance) / 100) * 100
-            pe_otm = round((spot_price - otm_distance) / 100) * 100
-        else:
+        step = _STRIKE_STEP.get(symbol)
+        if step is None:
             raise ValueError(f"Unsupported symbol for Hedged Strangle: {symbol}")
+        otm_distance, hedge_distance = self._strike_distances(symbol)
         
-        # Adjust OTM distance based on VIX (higher VIX = further OTM)
+        # Adjust OTM distance based on VIX (higher VIX = further OTM), rounded to the strike step
         vix_multiplier = min(1.5, current_vix / 25.0)  # Scale with VIX
         adjusted_otm = otm_distance * vix_multiplier
-        
-        if symbol == "NIFTY":
-            ce_otm = round((spot_price + adjusted_otm) / 50) * 50
-            pe_otm = round((spot_price - adjusted_otm) / 50) * 50
-        else:
-            ce_otm = round((spot_price + adjusted_otm) / 100) * 100
-            pe_otm = round((spot_price - adjusted_otm) / 100) * 100
+        ce_otm = round((spot_price + adjusted_otm) / step) * step
+        pe_otm = round((spot_price - adjusted_otm) / step) * step
         
         # Calculate hedge strikes
         ce_hedge = ce_otm + hedge_distance
@@ -318,6 +351,33 @@ class HedgedStrangleStrategy(BaseStrategy):
             "vix_adjustment": vix_multiplier
         }
 
+    def get_optimal_strikes_batch(self, spot_prices: np.ndarray, symbol: str,
+                                  current_vix: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        get_optimal_strikes over arrays of spot/VIX pairs (e.g. a selector grid scan)
+        Same keys as get_optimal_strikes; strikes come back as float arrays.
+        """
+        step = _STRIKE_STEP.get(symbol)
+        if step is None:
+            raise ValueError(f"Unsupported symbol for Hedged Strangle: {symbol}")
+        otm_distance, hedge_distance = self._strike_distances(symbol)
+        
+        spot_prices = np.asarray(spot_prices, dtype=np.float64)
+        vix_multiplier = np.minimum(1.5, np.asarray(current_vix, dtype=np.float64) / 25.0)
+        adjusted_otm = otm_distance * vix_multiplier
+        # np.round, like round(), rounds halves to even
+        ce_otm = np.round((spot_prices + adjusted_otm) / step) * step
+        pe_otm = np.round((spot_prices - adjusted_otm) / step) * step
+        
+        return {
+            "ce_otm_strike": ce_otm,
+            "pe_otm_strike": pe_otm,
+            "ce_hedge_strike": ce_otm + hedge_distance,
+            "pe_hedge_strike": pe_otm - hedge_distance,
+            "hedge_distance": hedge_distance,
+            "vix_adjustment": vix_multiplier
+        }
+
     def check_volatility_conditions(self, current_data: Dict, entry_data: Dict) -> Dict[str, Any]:
         """
         Check if volatility conditions are still favorable for the strangle
@@ -326,31 +386,21 @@ class HedgedStrangleStrategy(BaseStrategy):
         current_vix = current_data.get("vix", 20)
         iv_rank_current = current_data.get("iv_rank", 50)
         
-        vix_change_pct = (current_vix - entry_vix) / entry_vix * 100
-        
-        if current_vix < entry_vix * 0.7:  # 30% VIX drop
-            return {
-                "action": "VOLATILITY_CRUSH_ALERT",
-                "message": f"VIX crushed: {entry_vix:.1f} → {current_vix:.1f} ({vix_change_pct:+.1f}%)",
-                "recommended_action": "Consider early exit",
-                "urgency": "HIGH"
-            }
-        elif current_vix > entry_vix * 1.3:  # 30% VIX spike
-            return {
-                "action": "VOLATILITY_SPIKE_OPPORTUNITY",
-                "message": f"VIX spiked: {entry_vix:.1f} → {current_vix:.1f} ({vix_change_pct:+.1f}%)",
-                "recommended_action": "Monitor for profit taking opportunity",
-                "urgency": "MEDIUM"
-            }
-        elif iv_rank_current < 30:  # Low IV rank
-            return {
-                "action": "LOW_IV_WARNING",
-                "message": f"IV rank dropped to {iv_rank_current}",
-                "recommended_action": "Consider closing position",
-                "urgency": "MEDIUM"
-            }
+        code, vix_change_pct = _vix_state(entry_vix, current_vix, iv_rank_current)
+        if code == _VIX_OK:
+            return NO_ACTION
         
-        return {"action": None}
+        action, verb, recommended_action, urgency = _VIX_ALERTS[code]
+        if code == _VIX_LOW_IV:
+            message = f"IV rank dropped to {iv_rank_current}"
+        else:
+            message = f"VIX {verb}: {entry_vix:.1f} → {current_vix:.1f} ({vix_change_pct:+.1f}%)"
+        return {
+            "action": action,
+            "message": message,
+            "recommended_action": recommended_action,
+            "urgency": urgency
+        }
 
     def _calculate_max_loss(self, orders: List[Dict[str, Any]], spot_price: float) -> float:
         """
@@ -394,25 +444,99 @@ class HedgedStrangleStrategy(BaseStrategy):
         
         return {**base_metrics, **hedged_strangle_metrics}
 
+# check_volatility_conditions codes, in precedence order, and their
+# (action, message verb, recommended action, urgency)
+_VIX_OK = 0
+_VIX_CRUSH = 1
+_VIX_SPIKE = 2
+_VIX_LOW_IV = 3
+_VIX_ALERTS = (
+    None,
+    ("VOLATILITY_CRUSH_ALERT", "crushed", "Consider early exit", "HIGH"),
+    ("VOLATILITY_SPIKE_OPPORTUNITY", "spiked", "Monitor for profit taking opportunity", "MEDIUM"),
+    ("LOW_IV_WARNING", None, "Consider closing position", "MEDIUM")
+)
+
+def _vix_state(entry_vix: float, current_vix: float, iv_rank_current: float) -> Tuple[int, float]:
+    """Numeric core of check_volatility_conditions: (_VIX_* code, VIX change %)"""
+    vix_change_pct = (current_vix - entry_vix) / entry_vix * 100
+    if current_vix < entry_vix * 0.7:  # 30% VIX drop
+        return _VIX_CRUSH, vix_change_pct
+    if current_vix > entry_vix * 1.3:  # 30% VIX spike
+        return _VIX_SPIKE, vix_change_pct
+    if iv_rank_current < _LOW_IV_RANK:
+        return _VIX_LOW_IV, vix_change_pct
+    return _VIX_OK, vix_change_pct
+
+# Column layout of generate_legs rows
+_LEG_DTYPE = np.dtype([
+    ("strike", np.float64),
+    ("lots", np.int32),
+    ("quantity", np.int32),
+    ("priority", np.int8),
+    ("is_hedge", np.bool_),
+    ("side_is_buy", np.bool_),
+    ("option_is_call", np.bool_)
+])
+
+# Leg rows with the static template fields filled in; generate_legs copies and completes them
+_LEG_ROWS = np.array(
+    [
+        (0.0, 0, 0, fixed["priority"], fixed["is_hedge"], fixed["side"] == "BUY", fixed["option_type"] == "CE")
+        for _, fixed in HedgedStrangleStrategy._LEG_TEMPLATES
+    ],
+    dtype=_LEG_DTYPE
+)
+
+# Strike layout status codes shared by _strike_status and validate_strangle_strikes_batch
+_STRIKES_OK = 0
+_BAD_CALL = 1  # Call strikes not strictly above spot, hedge above short call
+_BAD_PUT = 2   # Put strikes not strictly below spot, hedge below short put
+
+def _strike_status(spot_price: float, ce_otm: float, pe_otm: float,
+                   ce_hedge: float, pe_hedge: float) -> int:
+    """Numeric core of _validate_strangle_strikes; call side is checked first"""
+    if ce_otm <= spot_price or ce_hedge <= ce_otm:
+        return _BAD_CALL
+    if pe_otm >= spot_price or pe_hedge >= pe_otm:
+        return _BAD_PUT
+    return _STRIKES_OK
+
+def validate_strangle_strikes_batch(spot_prices: np.ndarray, ce_otm: np.ndarray, pe_otm: np.ndarray,
+                                    ce_hedge: np.ndarray, pe_hedge: np.ndarray) -> np.ndarray:
+    """
+    Strike layout status for many candidates at once (0 ok, 1 bad call side, 2 bad put side)
+    Same precedence as the per-signal check; hedge distance warnings are not evaluated.
+    """
+    spot_prices, ce_otm, pe_otm, ce_hedge, pe_hedge = np.broadcast_arrays(
+        *(np.asarray(a, dtype=np.float64) for a in (spot_prices, ce_otm, pe_otm, ce_hedge, pe_hedge))
+    )
+    bad_call = (ce_otm <= spot_prices) | (ce_hedge <= ce_otm)
+    bad_put = (pe_otm >= spot_prices) | (pe_hedge >= pe_otm)
+    return np.where(bad_call, _BAD_CALL, np.where(bad_put, _BAD_PUT, _STRIKES_OK)).astype(np.int8)
+
 # Utility functions for Hedged Strangle analysis
 def validate_hedged_strangle_structure(orders: List[Dict[str, Any]]) -> bool:
     """Validate that orders represent proper Hedged Strangle structure"""
     if len(orders) != 4:
         return False
     
-    # Should have 2 calls and 2 puts
-    calls = [o for o in orders if o.get("option_type") == "CE"]
-    puts = [o for o in orders if o.get("option_type") == "PE"]
-    
-    if len(calls) != 2 or len(puts) != 2:
-        return False
-    
-    # Should have one short and one long for each type
-    call_sides = [o.get("side") for o in calls]
-    put_sides = [o.get("side") for o in puts]
+    # Should have one long and one short call and put, counted in a single pass
+    ce_buy = ce_sell = pe_buy = pe_sell = other = 0
+    for o in orders:
+        option_type = o.get("option_type")
+        is_buy = o.get("side") == "BUY"
+        is_sell = o.get("side") == "SELL"
+        if option_type == "CE":
+            ce_buy += is_buy
+            ce_sell += is_sell
+        elif option_type == "PE":
+            pe_buy += is_buy
+            pe_sell += is_sell
+        else:
+            other += 1
     
-    return ("BUY" in call_sides and "SELL" in call_sides and 
-            "BUY" in put_sides and "SELL" in put_sides)
+    return other == 0 and ce_buy == ce_sell == pe_buy == pe_sell == 1
 
 def calculate_strangle_breakevens(ce_strike: float, pe_strike: float, 
                                 net_credit: float) -> Dict[str, float]:
@@ -427,16 +551,20 @@ def calculate_strangle_breakevens(ce_strike: float, pe_strike: float,
 
 def check_hedge_first_execution(orders: List[Dict[str, Any]]) -> bool:
     """Verify that hedge orders have priority for execution first"""
-    hedge_orders = [o for o in orders if o.get("is_hedge", False)]
-    main_orders = [o for o in orders if not o.get("is_hedge", False)]
+    # Lowest priority of each group in one pass (None until the group is seen)
+    min_hedge_priority = min_main_priority = None
+    for o in orders:
+        priority = o.get("priority", 999)
+        if o.get("is_hedge", False):
+            if min_hedge_priority is None or priority < min_hedge_priority:
+                min_hedge_priority = priority
+        elif min_main_priority is None or priority < min_main_priority:
+            min_main_priority = priority
     
-    if not hedge_orders or not main_orders:
+    if min_hedge_priority is None or min_main_priority is None:
         return False
     
     # Check that all hedge orders have lower priority numbers (execute first)
-    min_hedge_priority = min(o.get("priority", 999) for o in hedge_orders)
-    min_main_priority = min(o.get("priority", 999) for o in main_orders)
-    
     return min_hedge_priority < min_main_priority
 
 # Export the strategy class and utilities
@@ -444,5 +572,6 @@ __all__ = [
     "HedgedStrangleStrategy",
     "validate_hedged_strangle_structure",
     "calculate_strangle_breakevens",
+    "validate_strangle_strikes_batch",
     "check_hedge_first_execution"
 ]
@@ -8,12 +8,30 @@ NIFTY/BANKNIFTY only | 4-leg hedged structure | Compatible with intelligent stra
 
 from datetime import datetime
 from typing import Dict, List, Any
-from app.strategies.base import BaseStrategy
+from types import MappingProxyType
+from app.strategies.base import BaseStrategy, option_symbol
 from app.config import StrategyType, get_instrument_config, validate_instrument_liquidity
 import logging
 
 logger = logging.getLogger("IronCondorStrategy")
 
+# Descriptive part of get_strategy_specific_metrics; does not depend on parameters
+_PROFILE_METRICS = MappingProxyType({
+    "risk_profile": "LIMITED (wing width minus credit)",
+    "profit_profile": "LIMITED (net credit collected)",
+    "market_outlook": "NEUTRAL/RANGE-BOUND",
+    "theta_strategy": True,
+    "vega_strategy": "SHORT (benefits from IV crush)",
+    "gamma_risk": "LOW (hedged structure)",
+    "best_conditions": "Low VIX, range-bound market, high implied volatility"
+})
+
+# (strike interval, short strike OTM offset) per instrument
+_STRIKE_PARAMS = MappingProxyType({
+    "NIFTY": (50, 100),
+    "BANKNIFTY": (100, 300)
+})
+
 class IronCondorStrategy(BaseStrategy):
     """
     Iron Condor Options Strategy - 4-leg hedged structure:
@@ -52,28 +70,31 @@ class IronCondorStrategy(BaseStrategy):
         - No major events or expiry day
         - Sufficient time to expiry
         """
-        symbol = market_data.get("symbol")
-        vix = market_data.get("vix", 0)
-        index_chg = abs(market_data.get("index_chg_pct", 0))
-        events = market_data.get("upcoming_events", [])
-        expiry = market_data.get("is_expiry", False)
-        trend_strength = abs(market_data.get("trend_strength", 0))
-        days_to_expiry = market_data.get("days_to_expiry", 0)
+        get = market_data.get
+        symbol = get("symbol")
+        
+        # Cheapest and most-rejecting checks first; liquidity validation last
+        if symbol not in self._allowed_set:
+            return False
+        if get("is_expiry", False):
+            return False
+        if not self.min_vix <= get("vix", 0) <= self.max_vix:
+            return False
+        if not self.min_days_to_expiry <= get("days_to_expiry", 0) <= self.max_days_to_expiry:
+            return False
+        if get("upcoming_events", []):
+            return False
+        if not abs(get("trend_strength", 0)) < 1.5:  # Not strongly trending
+            return False
+        if not abs(get("index_chg_pct", 0)) < settings.get("DANGER_ZONE_WARNING", 1.0):
+            return False
         
         # Strict liquidity validation
         if not validate_instrument_liquidity(symbol):
             logger.warning(f"Iron Condor rejected: {symbol} not in liquid instruments")
             return False
         
-        return (
-            symbol in self.allowed_instruments and
-            self.min_vix <= vix <= self.max_vix and
-            index_chg < settings.get("DANGER_ZONE_WARNING", 1.0) and
-            trend_strength < 1.5 and  # Not strongly trending
-            not expiry and
-            not events and
-            self.min_days_to_expiry <= days_to_expiry <= self.max_days_to_expiry
-        )
+        return True
 
     def generate_orders(self, signal: Dict, config: Dict, lot_size: int) -> List[Dict[str, Any]]:
         """
@@ -98,69 +119,69 @@ class IronCondorStrategy(BaseStrategy):
         # Get instrument configuration
         instrument_config = get_instrument_config(symbol)
         lot_qty = instrument_config.get("lot_size", 50)
+        quantity = lots * lot_qty
+        premiums = signal.get("estimated_premiums", {})
         
         orders = [
             # 1. SELL OTM Call (main leg)
             {
-                "symbol": f"{symbol}{expiry}{int(strikes['ce_sale'])}CE",
+                "symbol": option_symbol(symbol, expiry, int(strikes['ce_sale']), "CE"),
                 "side": "SELL",
                 "lots": lots,
-                "quantity": lots * lot_qty,
+                "quantity": quantity,
                 "leg_type": "short_call",
                 "is_hedge": False,
                 "strike": strikes['ce_sale'],
                 "option_type": "CE",
                 "expiry": expiry,
-                "expected_premium": signal.get("estimated_premiums", {}).get("ce_sale", 0)
+                "expected_premium": premiums.get("ce_sale", 0)
             },
             
             # 2. BUY Far OTM Call (hedge)
             {
-                "symbol": f"{symbol}{expiry}{int(strikes['ce_hedge'])}CE",
+                "symbol": option_symbol(symbol, expiry, int(strikes['ce_hedge']), "CE"),
                 "side": "BUY",
                 "lots": lots,
-                "quantity": lots * lot_qty,
+                "quantity": quantity,
                 "leg_type": "long_call_hedge",
                 "is_hedge": True,
                 "strike": strikes['ce_hedge'],
                 "option_type": "CE",
                 "expiry": expiry,
-                "expected_premium": signal.get("estimated_premiums", {}).get("ce_hedge", 0)
+                "expected_premium": premiums.get("ce_hedge", 0)
             },
             
             # 3. SELL OTM Put (main leg)
             {
-                "symbol": f"{symbol}{expiry}{int(strikes['pe_sale'])}PE",
+                "symbol": option_symbol(symbol, expiry, int(strikes['pe_sale']), "PE"),
                 "side": "SELL",
                 "lots": lots,
-                "quantity": lots * lot_qty,
+                "quantity": quantity,
                 "leg_type": "short_put",
                 "is_hedge": False,
                 "strike": strikes['pe_sale'],
                 "option_type": "PE",
                 "expiry": expiry,
-                "expected_premium": signal.get("estimated_premiums", {}).get("pe_sale", 0)
+                "expected_premium": premiums.get("pe_sale", 0)
             },
             
             # 4. BUY Far OTM Put (hedge)
             {
-                "symbol": f"{symbol}{expiry}{int(strikes['pe_hedge'])}PE",
+                "symbol": option_symbol(symbol, expiry, int(strikes['pe_hedge']), "PE"),
                 "side": "BUY",
                 "lots": lots,
-                "quantity": lots * lot_qty,
+                "quantity": quantity,
                 "leg_type": "long_put_hedge",
                 "is_hedge": True,
                 "strike": strikes['pe_hedge'],
                 "option_type": "PE", 
                 "expiry": expiry,
-                "expected_premium": signal.get("estimated_premiums", {}).get("pe_hedge", 0)
+                "expected_premium": premiums.get("pe_hedge", 0)
             }
         ]
         
         # Calculate expected net credit
-        estimated_credit = self._calculate_estimated_credit(
-            signal.get("estimated_premiums", {}), lots * lot_qty
-        )
+        estimated_credit = self._calculate_estimated_credit(premiums, quantity)
         
         logger.info(f"Generated Iron Condor for {symbol}: "
                    f"Call Spread: {strikes['ce_sale']}/{strikes['ce_hedge']}, "
@@ -227,30 +248,30 @@ class IronCondorStrategy(BaseStrategy):
         pe_hedge = strikes.get('pe_hedge', 0)
         
         # Basic validation
-        if not all([ce_sale, ce_hedge, pe_sale, pe_hedge]):
+        if not (ce_sale and ce_hedge and pe_sale and pe_hedge):
             logger.error("Missing strike prices in Iron Condor")
             return False
         
         # Call strikes validation (should be above spot)
         if ce_sale <= spot_price or ce_hedge <= ce_sale:
-            logger.error(f"Invalid call strikes: spot={spot_price}, ce_sale={ce_sale}, ce_hedge={ce_hedge}")
+            logger.error("Invalid call strikes: spot=%s, ce_sale=%s, ce_hedge=%s", spot_price, ce_sale, ce_hedge)
             return False
         
         # Put strikes validation (should be below spot)  
         if pe_sale >= spot_price or pe_hedge >= pe_sale:
-            logger.error(f"Invalid put strikes: spot={spot_price}, pe_sale={pe_sale}, pe_hedge={pe_hedge}")
+            logger.error("Invalid put strikes: spot=%s, pe_sale=%s, pe_hedge=%s", spot_price, pe_sale, pe_hedge)
             return False
         
         # Wing width validation
         call_wing_width = ce_hedge - ce_sale
         put_wing_width = pe_sale - pe_hedge
-        expected_width = self.preferred_wing_width_banknifty if symbol == "BANKNIFTY" else self.preferred_wing_width_nifty
+        expected_width = self._wing_width(symbol)
         
         if call_wing_width != put_wing_width:
-            logger.warning(f"Unequal wing widths: call={call_wing_width}, put={put_wing_width}")
+            logger.warning("Unequal wing widths: call=%s, put=%s", call_wing_width, put_wing_width)
         
         if call_wing_width < expected_width * 0.5 or call_wing_width > expected_width * 2:
-            logger.warning(f"Wing width {call_wing_width} outside preferred range for {symbol}")
+            logger.warning("Wing width %s outside preferred range for %s", call_wing_width, symbol)
         
         return True
 
@@ -264,23 +285,24 @@ class IronCondorStrategy(BaseStrategy):
         net_credit_per_share = (ce_sale_premium + pe_sale_premium) - (ce_hedge_premium + pe_hedge_premium)
         return net_credit_per_share * total_quantity
 
+    def _wing_width(self, symbol: str) -> float:
+        """Preferred wing width for a symbol; other symbols use the NIFTY width"""
+        return self.preferred_wing_width_banknifty if symbol == "BANKNIFTY" else self.preferred_wing_width_nifty
+
     def get_optimal_strikes(self, spot_price: float, symbol: str, 
                           days_to_expiry: int) -> Dict[str, float]:
         """
         Calculate optimal Iron Condor strikes based on spot price and symbol
         """
-        if symbol == "NIFTY":
-            # NIFTY strikes (50-point intervals)
-            wing_width = self.preferred_wing_width_nifty
-            ce_sale = round((spot_price + 100) / 50) * 50  # 100 points OTM
-            pe_sale = round((spot_price - 100) / 50) * 50  # 100 points OTM
-        elif symbol == "BANKNIFTY":
-            # BANKNIFTY strikes (100-point intervals)  
-            wing_width = self.preferred_wing_width_banknifty
-            ce_sale = round((spot_price + 300) / 100) * 100  # 300 points OTM
-            pe_sale = round((spot_price - 300) / 100) * 100  # 300 points OTM
-        else:
+        params = _STRIKE_PARAMS.get(symbol)
+        if params is None:
             raise ValueError(f"Unsupported symbol for Iron Condor: {symbol}")
+        interval, otm_offset = params
+        wing_width = self._wing_width(symbol)
+        
+        # Short strikes otm_offset points OTM, rounded to the strike interval
+        ce_sale = round((spot_price + otm_offset) / interval) * interval
+        pe_sale = round((spot_price - otm_offset) / interval) * interval
         
         # Calculate hedge strikes
         ce_hedge = ce_sale + wing_width
@@ -313,6 +335,8 @@ class IronCondorStrategy(BaseStrategy):
         """Get Iron Condor specific performance metrics"""
         base_metrics = self.get_strategy_info()
         
+        # Base info carries live state (is_active) and tunable parameters are read per
+        # call, so only the descriptive profile is shared
         iron_condor_metrics = {
             "wing_widths": {
                 "NIFTY": self.preferred_wing_width_nifty,
@@ -321,13 +345,7 @@ class IronCondorStrategy(BaseStrategy):
             "min_credit_target": self.min_credit_target,
             "vix_range": {"min": self.min_vix, "max": self.max_vix},
             "dte_range": {"min": self.min_days_to_expiry, "max": self.max_days_to_expiry},
-            "risk_profile": "LIMITED (wing width minus credit)",
-            "profit_profile": "LIMITED (net credit collected)",
-            "market_outlook": "NEUTRAL/RANGE-BOUND",
-            "theta_strategy": True,
-            "vega_strategy": "SHORT (benefits from IV crush)",
-            "gamma_risk": "LOW (hedged structure)",
-            "best_conditions": "Low VIX, range-bound market, high implied volatility"
+            **_PROFILE_METRICS
         }
         
         return {**base_metrics, **iron_condor_metrics}
@@ -338,19 +356,21 @@ def validate_iron_condor_structure(orders: List[Dict[str, Any]]) -> bool:
     if len(orders) != 4:
         return False
     
-    # Should have 2 calls and 2 puts
-    calls = [o for o in orders if o.get("option_type") == "CE"]
-    puts = [o for o in orders if o.get("option_type") == "PE"]
-    
-    if len(calls) != 2 or len(puts) != 2:
-        return False
-    
-    # Should have one short and one long for each type
-    call_sides = [o.get("side") for o in calls]
-    put_sides = [o.get("side") for o in puts]
+    # Should have one long and one short call and put, counted in a single pass
+    ce_buy = ce_sell = pe_buy = pe_sell = other = 0
+    for o in orders:
+        option_type = o.get("option_type")
+        side = o.get("side")
+        if option_type == "CE":
+            ce_buy += side == "BUY"
+            ce_sell += side == "SELL"
+        elif option_type == "PE":
+            pe_buy += side == "BUY"
+            pe_sell += side == "SELL"
+        else:
+            other += 1
     
-    return ("BUY" in call_sides and "SELL" in call_sides and 
-            "BUY" in put_sides and "SELL" in put_sides)
+    return other == 0 and ce_buy == ce_sell == pe_buy == pe_sell == 1
 
 def calculate_iron_condor_breakevens(strikes: Dict[str, float], 
                                    net_credit: float) -> Dict[str, float]:
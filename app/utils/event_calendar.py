@@ -56,6 +56,13 @@ class ExpiryInfo:
     is_last_trading_day: bool
     settlement_date: date
 
+@dataclass
+class CalendarSnapshot:
+    today: date
+    holidays_count: int  # Market holidays loaded for today's year
+    is_trading_day: bool
+    expiries: Dict[str, Dict[str, Any]]  # get_next_expiry_info() per instrument
+
 class EventCalendar:
     """
     Future-proof event calendar for F&O trading
@@ -715,13 +722,14 @@ class EventCalendar:
         self.events_cache[date_key].append(event)
         logger.info(f"Added custom event: {event.title} on {event.date}")
     
-    def get_next_expiry_info(self, instrument: str) -> Dict[str, Any]:
+    def get_next_expiry_info(self, instrument: str, 
+                            reference_date: Optional[date] = None) -> Dict[str, Any]:
         """Get comprehensive next expiry information"""
-        today = date.today()
+        today = reference_date or date.today()
         
         try:
-            weekly_expiry = self.get_expiry_date(instrument, "weekly")
-            monthly_expiry = self.get_expiry_date(instrument, "monthly")
+            weekly_expiry = self.get_expiry_date(instrument, "weekly", today)
+            monthly_expiry = self.get_expiry_date(instrument, "monthly", today)
             
             # Determine which is next
             if weekly_expiry and monthly_expiry:
@@ -758,6 +766,22 @@ class EventCalendar:
             logger.error(f"Error getting expiry info for {instrument}: {e}")
             return {"error": f"Failed to get expiry info: {str(e)}"}
     
+    def snapshot(self, today: date, instruments: List[str]) -> CalendarSnapshot:
+        """Collect holiday, trading-day and next-expiry facts for a date in one call"""
+        if today.year not in self.market_holidays:
+            self._refresh_holidays_for_year(today.year)
+        year_holidays = self.market_holidays.get(today.year, [])
+        
+        return CalendarSnapshot(
+            today=today,
+            holidays_count=len(year_holidays),
+            is_trading_day=today.weekday() < 5 and today not in year_holidays,
+            expiries={
+                instrument: self.get_next_expiry_info(instrument, today)
+                for instrument in instruments
+            }
+        )
+    
     def auto_refresh_check(self):
         """Check if automatic refresh is needed (call this periodically)"""
         # Refresh if it's been more than 24 hours since last refresh
@@ -810,6 +834,7 @@ __all__ = [
     "EventCalendar",
     "MarketEvent",
     "ExpiryInfo", 
+    "CalendarSnapshot",
     "EventType",
     "EventImpact",
     "event_calendar",
@@ -19,7 +19,9 @@ import sys
 import os
 import logging
 from decimal import Decimal
+import math
 import json
+import numpy as np
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
@@ -28,16 +30,23 @@ from app.config import settings
 
 # Import all 8 hedged strategies
 from app.strategies.iron_condor import IronCondorStrategy, validate_iron_condor_structure
-from app.strategies.butterfly_spread import ButterflySpreadStrategy, validate_butterfly_spread_structure
-from app.strategies.calendar_spread import CalendarSpreadStrategy, validate_calendar_spread_structure
+from app.strategies.butterfly_spread import (
+    ButterflySpreadStrategy, validate_butterfly_spread_structure, payoff_grid
+)
+from app.strategies.calendar_spread import (
+    CalendarSpreadStrategy, validate_calendar_spread_structure,
+    calculate_time_decay_advantage, calculate_time_decay_advantage_batch
+)
 from app.strategies.hedged_strangle import HedgedStrangleStrategy, validate_hedged_strangle_structure
 from app.strategies.directional_futures import DirectionalFuturesStrategy, validate_directional_futures_structure
 from app.strategies.jade_lizard import JadeLizardStrategy, validate_jade_lizard_structure
 from app.strategies.ratio_spreads import RatioSpreadsStrategy, validate_ratio_spread_structure
-from app.strategies.broken_wing_butterfly import BrokenWingButterflyStrategy, validate_broken_wing_structure
+from app.strategies.broken_wing_butterfly import (
+    BrokenWingButterflyStrategy, validate_broken_wing_structure, BIAS_CODES, BATCH_ACTIONS
+)
 
 # Import base strategy and related components
-from app.strategies.base import BaseStrategy
+from app.strategies.base import BaseStrategy, TickContext
 from app.strategies.strategy_selector import StrategySelector
 from app.utils.event_calendar import event_calendar
 from app.risk.danger_zone import danger_monitor
@@ -131,6 +140,32 @@ class TestBaseStrategy(unittest.TestCase):
         self.assertEqual(performance["total_pnl"], 2900)
         
         logger.info("✅ Performance tracking test passed")
+    
+    def test_on_tick_matches_on_mtm_tick(self):
+        """Test the TickContext adapter against direct on_mtm_tick calls"""
+        logger.info("⏱️ Testing on_tick adapter...")
+        
+        strategies = [HedgedStrangleStrategy(), DirectionalFuturesStrategy(), CalendarSpreadStrategy()]
+        config = {"entry_vix": 22, "current_vix": 22, "days_to_expiry": 20}
+        
+        for strategy in strategies:
+            # Unset snapshot fields fall back to the stored config
+            self.assertEqual(
+                dict(strategy.on_tick(TickContext(mtm=100.0), config, 1)),
+                dict(strategy.on_mtm_tick(100.0, config, 1))
+            )
+            
+            # Live tick values take precedence over the stored config
+            live = {**config, "current_vix": 12, "days_to_expiry": 2}
+            self.assertEqual(
+                dict(strategy.on_tick(TickContext(mtm=100.0, vix=12, days_to_expiry=2), config, 1)),
+                dict(strategy.on_mtm_tick(100.0, live, 1))
+            )
+        
+        # The adapter never mutates the caller's config
+        self.assertEqual(config, {"entry_vix": 22, "current_vix": 22, "days_to_expiry": 20})
+        
+        logger.info("✅ on_tick adapter test passed")
 
 class TestIronCondorStrategy(unittest.TestCase):
     """Test Iron Condor Strategy (4-leg hedged)"""
@@ -351,6 +386,72 @@ class TestButterflySpreadStrategy(unittest.TestCase):
         self.assertTrue(validate_butterfly_spread_structure(orders))
         
         logger.info("✅ Butterfly Spread order generation test passed")
+    
+    def test_butterfly_batch_order_generation(self):
+        """Test batch order generation matches per-signal generation"""
+        logger.info("📋 Testing Butterfly Spread batch order generation...")
+        
+        signals = [
+            self.test_signal,
+            {"symbol": "BANKNIFTY", "expiry": "01AUG", "center_strike": 48000, "option_type": "PE"}
+        ]
+        
+        batch_orders = self.butterfly.generate_orders_batch(signals, {"lot_count": 1}, 50)
+        single_orders = [
+            order for signal in signals
+            for order in self.butterfly.generate_orders(signal, {"lot_count": 1}, 50)
+        ]
+        
+        self.assertEqual(batch_orders, single_orders)
+        
+        with self.assertRaises(ValueError):
+            self.butterfly.generate_orders_batch(
+                [dict(self.test_signal, wing_width=-50)], {"lot_count": 1}, 50
+            )
+        
+        logger.info("✅ Butterfly Spread batch order generation test passed")
+    
+    def test_butterfly_payoff_grid(self):
+        """Test grid payoff matches the scalar payoff and reuses the out buffer"""
+        logger.info("📈 Testing Butterfly Spread payoff grid...")
+        
+        strikes_soa = {
+            "lower": np.array([21900, 47800]),
+            "center": np.array([22000, 48000]),
+            "upper": np.array([22100, 48200])
+        }
+        spot_grid = np.array([21850.0, 22000.0, 22080.0, 48000.0])
+        buffer = np.empty((4, 2), dtype=np.float32)
+        
+        grid = payoff_grid(strikes_soa, spot_grid, 30.0, out=buffer)
+        self.assertIs(grid, buffer)
+        self.assertEqual(grid.dtype, np.float32)
+        
+        for i, spot in enumerate(spot_grid):
+            for j in range(2):
+                strikes = {
+                    "lower_strike": strikes_soa["lower"][j],
+                    "center_strike": strikes_soa["center"][j],
+                    "upper_strike": strikes_soa["upper"][j]
+                }
+                expected = self.butterfly.calculate_butterfly_payoff(strikes, float(spot), 30.0)
+                self.assertAlmostEqual(grid[i, j], expected)
+        
+        logger.info("✅ Butterfly Spread payoff grid test passed")
+    
+    def test_butterfly_mtm_edge_inputs(self):
+        """Test NaN MTM and zero lots follow the plain SL/TP comparisons"""
+        logger.info("🛡️ Testing Butterfly Spread MTM edge inputs...")
+        
+        config = {"sl_per_lot": 1200, "tp_per_lot": 2000, "days_to_expiry": 10}
+        
+        # A missing quote (NaN MTM) must not trigger any exit
+        self.assertIsNone(self.butterfly.on_mtm_tick(math.nan, config, 1)["action"])
+        
+        # With no lots SL and TP are both 0; the stop is checked first
+        self.assertEqual(self.butterfly.on_mtm_tick(0.0, config, 0)["action"], "HARD_STOP")
+        
+        logger.info("✅ Butterfly Spread MTM edge inputs test passed")
 
 class TestHedgedStrangleStrategy(unittest.TestCase):
     """Test Hedged Strangle Strategy (4-leg hedged)"""
@@ -421,6 +522,24 @@ class TestHedgedStrangleStrategy(unittest.TestCase):
         self.assertTrue(validate_hedged_strangle_structure(orders))
         
         logger.info("✅ Hedged Strangle order generation test passed")
+    
+    def test_hedged_strangle_optimal_strikes_batch(self):
+        """Test batch optimal strikes match the scalar calculation"""
+        logger.info("🎯 Testing Hedged Strangle batch optimal strikes...")
+        
+        spot_prices = np.array([48000.0, 48150.0, 47990.0, 49020.0])
+        vix_levels = np.array([20.0, 28.0, 40.0, 12.5])
+        
+        batch = self.hedged_strangle.get_optimal_strikes_batch(spot_prices, "BANKNIFTY", vix_levels)
+        
+        for i in range(len(spot_prices)):
+            expected = self.hedged_strangle.get_optimal_strikes(spot_prices[i], "BANKNIFTY", vix_levels[i])
+            self.assertEqual(batch["ce_otm_strike"][i], expected["ce_otm_strike"])
+            self.assertEqual(batch["pe_otm_strike"][i], expected["pe_otm_strike"])
+            self.assertEqual(batch["ce_hedge_strike"][i], expected["ce_hedge_strike"])
+            self.assertEqual(batch["pe_hedge_strike"][i], expected["pe_hedge_strike"])
+        
+        logger.info("✅ Hedged Strangle batch optimal strikes test passed")
 
 class TestDirectionalFuturesStrategy(unittest.TestCase):
     """Test Directional Futures Strategy (2-leg hedged)"""
@@ -492,6 +611,22 @@ class TestDirectionalFuturesStrategy(unittest.TestCase):
         self.assertTrue(validate_directional_futures_structure(orders))
         
         logger.info("✅ Directional Futures order generation test passed")
+    
+    def test_directional_futures_black_scholes_delta(self):
+        """Test Black-Scholes position delta against the closed form"""
+        logger.info("📐 Testing Directional Futures Black-Scholes delta...")
+        
+        orders = self.directional_futures.generate_orders(self.test_signal, {"lot_count": 1}, 50)
+        spot, strike, vol, t = 22000, 21700, 0.15, 7 / 365
+        
+        d1 = (math.log(spot / strike) + 0.5 * vol ** 2 * t) / (vol * math.sqrt(t))
+        put_delta = 0.5 * (1 + math.erf(d1 / math.sqrt(2))) - 1
+        
+        delta = self.directional_futures.calculate_position_delta(orders, spot, volatility=vol, time_to_expiry=t)
+        self.assertAlmostEqual(delta, 1.0 + put_delta, places=6)
+        self.assertLess(delta, 1.0, "Long put hedge should reduce long futures delta")
+        
+        logger.info("✅ Directional Futures Black-Scholes delta test passed")
 
 class TestJadeLizardStrategy(unittest.TestCase):
     """Test Jade Lizard Strategy (3-leg hedged)"""
@@ -661,6 +796,35 @@ class TestBrokenWingButterflyStrategy(unittest.TestCase):
         self.assertTrue(validate_broken_wing_structure(orders))
         
         logger.info("✅ Broken Wing Butterfly order generation test passed")
+    
+    def test_broken_wing_batch_mtm_matches_scalar(self):
+        """Test vectorized MTM evaluation agrees with on_mtm_tick"""
+        logger.info("⚡ Testing Broken Wing Butterfly batch MTM evaluation...")
+        
+        positions = [
+            # (mtm, dte, underlying move %, bias)
+            (-2100, 10, 0.0, "NEUTRAL"),
+            (5500, 10, 0.5, "BULLISH"),
+            (-1200, 2, -2.0, "BEARISH"),
+            (-1300, 10, -1.2, "BULLISH"),
+            (2800, 5, 0.0, "NEUTRAL"),
+            (100, 10, 0.0, "NEUTRAL")
+        ]
+        mtm, dte, move, bias = (np.array(col) for col in zip(*positions))
+        codes = self.broken_wing.on_mtm_tick_batch(
+            mtm, np.full(len(positions), 2000.0), np.full(len(positions), 4500.0),
+            dte, move, np.array([BIAS_CODES[b] for b in bias])
+        )
+        
+        for (p_mtm, p_dte, p_move, p_bias), code in zip(positions, codes):
+            expected = self.broken_wing.on_mtm_tick(p_mtm, {
+                "days_to_expiry": p_dte,
+                "underlying_change_pct": p_move,
+                "directional_bias": p_bias
+            }, 1).get("action")
+            self.assertEqual(BATCH_ACTIONS[code] if code >= 0 else None, expected)
+        
+        logger.info("✅ Broken Wing Butterfly batch MTM test passed")
 
 class TestCalendarSpreadStrategy(unittest.TestCase):
     """Test Calendar Spread Strategy (4-leg hedged)"""
@@ -721,6 +885,22 @@ class TestCalendarSpreadStrategy(unittest.TestCase):
         self.assertTrue(validate_calendar_spread_structure(orders))
         
         logger.info("✅ Calendar Spread order generation test passed")
+    
+    def test_calendar_time_decay_batch(self):
+        """Test batch time decay advantage matches the scalar calculation"""
+        logger.info("⏳ Testing Calendar Spread batch time decay advantage...")
+        
+        near_days = np.array([7, 0, 14, 10, 5])
+        far_days = np.array([30, 30, 14, 45, 35])
+        current_iv = np.array([18.0, 20.0, 25.0, 50.0, 5.0])
+        
+        batch = calculate_time_decay_advantage_batch(near_days, far_days, current_iv)
+        
+        for i in range(len(near_days)):
+            expected = calculate_time_decay_advantage(near_days[i], far_days[i], current_iv[i])
+            self.assertAlmostEqual(batch[i], expected)
+        
+        logger.info("✅ Calendar Spread batch time decay advantage test passed")
 
 class TestStrategyIntegration(unittest.TestCase):
     """Test strategy integration with system components"""